@@ -0,0 +1,155 @@
+"""Запросы в секунду и задержка лент и страницы публикации: WSGI и ASGI.
+
+``CONCURRENCY`` одновременных клиентов обращаются к приложению напрямую,
+без HTTP-сервера, поэтому сравнивается только обработка запроса:
+
+* ``wsgi`` — ``blogicum.wsgi``, по потоку на клиента, как у
+  многопоточного WSGI-сервера;
+* ``asgi-sync`` — ``blogicum.asgi`` с синхронными представлениями;
+* ``asgi`` — ``blogicum.asgi`` с ``ASYNC_VIEWS`` (``blog.async_views``).
+
+Кэш страниц отключён, каждый запрос обращается к базе данных.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from wsgiref.util import setup_testing_defaults
+
+from common import percentile, run_load, setup_django
+
+SCENARIOS = {
+    'wsgi': ('blogicum.wsgi', '0'),
+    'asgi-sync': ('blogicum.asgi', '0'),
+    'asgi': ('blogicum.asgi', '1'),
+}
+CONCURRENCY = 64
+DURATION = 10
+POSTS = 200
+URLS = (
+    '/',
+    '/category/bench/',
+    '/profile/bench_user_0/',
+    '/posts/{post_id}/',
+)
+
+
+def get_url(client, step):
+    url = URLS[(client + step) % len(URLS)]
+    return url.format(post_id=(client * 7 + step) % POSTS + 1)
+
+
+def wsgi_client(application, client):
+    def start_response(status, headers):
+        start_response.status = status
+
+    def request(step):
+        environ = {'PATH_INFO': get_url(client, step)}
+        setup_testing_defaults(environ)
+        environ['HTTP_HOST'] = 'testserver'
+        body = application(environ, start_response)
+        b''.join(body)
+        body.close()
+        assert start_response.status.startswith('200'), environ['PATH_INFO']
+
+    return request
+
+
+async def asgi_request(application, url):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application({
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url,
+        'raw_path': url.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', b'testserver')],
+        'client': ('127.0.0.1', 40000),
+        'server': ('testserver', 80),
+    }, receive, send)
+    assert messages[0]['status'] == 200, url
+
+
+async def run_asgi_load(application):
+    latency = []
+    deadline = time.perf_counter() + DURATION
+
+    async def client_loop(client):
+        step = 0
+        while time.perf_counter() < deadline:
+            step += 1
+            started = time.perf_counter()
+            await asgi_request(application, get_url(client, step))
+            latency.append((time.perf_counter() - started) * 1000)
+
+    await asyncio.gather(*(client_loop(i) for i in range(CONCURRENCY)))
+    return {
+        'rps': len(latency) / DURATION,
+        'p50': percentile(latency, 0.5),
+        'p99': percentile(latency, 0.99),
+        'errors': 0,
+    }
+
+
+def child(scenario):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    setup_django()
+    from django.conf import settings
+
+    settings.PAGE_CACHE_TTL = {}
+    module, _ = SCENARIOS[scenario]
+    application = __import__(module, fromlist=['application']).application
+    if module == 'blogicum.wsgi':
+        workers = [
+            ('page', wsgi_client(application, client))
+            for client in range(CONCURRENCY)
+        ]
+        result = run_load(workers, DURATION)['page']
+    else:
+        result = asyncio.run(run_asgi_load(application))
+    print(json.dumps(result))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(
+            BENCH_DB=os.path.join(tmp, 'bench.sqlite3'),
+            DJANGO_SETTINGS_MODULE='bench_settings')
+        setup_django()
+        from common import seed_database
+
+        seed_database(posts=POSTS)
+        results = {}
+        for scenario, (_, async_views) in SCENARIOS.items():
+            env = dict(os.environ, BENCH_ASYNC_VIEWS=async_views)
+            output = subprocess.run(
+                [sys.executable, __file__, scenario],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[scenario] = json.loads(output.splitlines()[-1])
+    print(f'{CONCURRENCY} клиентов, {DURATION} с')
+    print(f'{"":<10} {"rps":>8} {"p50, ms":>8} {"p99, ms":>8}')
+    for scenario, values in results.items():
+        print(f'{scenario:<10} {values["rps"]:>8.1f} {values["p50"]:>8.1f}'
+              f' {values["p99"]:>8.1f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
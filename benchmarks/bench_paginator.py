@@ -0,0 +1,32 @@
+"""Размер и время рендеринга includes/paginator.html от числа публикаций.
+
+С ограниченным окном номеров обе величины не должны расти с числом
+публикаций.
+"""
+from common import setup_django, timeit
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.template.loader import get_template  # noqa: E402
+
+from blog.paginators import CountStrategyPaginator  # noqa: E402
+
+POST_COUNTS = (1_000, 10_000, 50_000, 500_000, 5_000_000)
+
+
+def main():
+    template = get_template('includes/paginator.html')
+    print(f'{"posts":>10} {"pages":>8} {"html, B":>8} {"render, ms":>11}')
+    for count in POST_COUNTS:
+        paginator = CountStrategyPaginator(range(count), settings.PAGE_SIZE)
+        page = paginator.page(paginator.num_pages // 2)
+        context = {'page_obj': page, 'paginator': paginator}
+        html = template.render(context)
+        elapsed = timeit(lambda: template.render(context))
+        print(f'{count:>10} {paginator.num_pages:>8} {len(html.encode()):>8}'
+              f' {elapsed:>11.3f}')
+
+
+if __name__ == '__main__':
+    main()
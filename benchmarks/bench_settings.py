@@ -0,0 +1,33 @@
+"""Настройки для замеров: production-режим, отдельные база и кэш."""
+import os
+import tempfile
+
+# Замеры не должны делить файловый кэш с сервером на той же машине.
+# Каталог задаётся до импорта настроек и наследуется подпроцессами.
+if 'BLOGICUM_CACHE_DIR' not in os.environ:
+    os.environ['BLOGICUM_CACHE_DIR'] = tempfile.mkdtemp(
+        prefix='blogicum-bench-cache-')
+
+from blogicum.settings import *  # noqa: E402, F401, F403
+from blogicum.settings import (  # noqa: E402
+    ALLOWED_HOSTS, MIDDLEWARE, TEMPLATE_LOADERS, TEMPLATES,
+)
+
+DEBUG = False
+
+ALLOWED_HOSTS = ALLOWED_HOSTS + ['testserver']
+
+MIDDLEWARE = [name for name in MIDDLEWARE if 'debug_toolbar' not in name]
+
+ASYNC_VIEWS = os.environ.get('BENCH_ASYNC_VIEWS') == '1'
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.environ.get('BENCH_DB_ENGINE', 'blogicum.sqlite'),
+        'NAME': os.environ.get('BENCH_DB', ':memory:'),
+    }
+}
+
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+]
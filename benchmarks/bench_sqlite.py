@@ -0,0 +1,109 @@
+"""Пропускная способность страниц при одновременных чтении и записи.
+
+Читатели запрашивают ленту и страницы публикаций, писатели добавляют
+комментарии; все работают в потоках одного процесса, каждый запрос
+открывает своё соединение (``CONN_MAX_AGE = 0``). Сценарии запускаются
+в отдельных интерпретаторах на копиях одной базы:
+
+* ``stock`` — ``django.db.backends.sqlite3`` без настройки соединения;
+* ``tuned`` — ``blogicum.sqlite`` с ``SQLITE_PRAGMAS`` и
+  ``SQLITE_TRANSACTION_MODE`` из настроек.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from common import run_load, setup_django
+
+ENGINES = {
+    'stock': 'django.db.backends.sqlite3',
+    'tuned': 'blogicum.sqlite',
+}
+READERS = 8
+WRITERS = 4
+DURATION = 5
+POSTS = 200
+
+
+def reader(index):
+    from django.test import Client
+
+    client = Client()
+
+    def request(step):
+        post_id = (index + step) % POSTS + 1
+        url = '/' if step % 2 else f'/posts/{post_id}/'
+        assert client.get(url).status_code == 200, url
+
+    return request
+
+
+def writer(user, index):
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+
+    def request(step):
+        url = f'/posts/{(index * 31 + step) % POSTS + 1}/comment/'
+        response = client.post(url, {'text': f'Комментарий {step}'})
+        assert response.status_code == 302, url
+
+    return request
+
+
+def child():
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+
+    settings.PAGE_CACHE_TTL = {}
+    users = get_user_model().objects.order_by('id')[:WRITERS]
+    workers = [('read', reader(index)) for index in range(READERS)]
+    workers += [
+        ('write', writer(user, index)) for index, user in enumerate(users)
+    ]
+    print(json.dumps(run_load(workers, DURATION, OperationalError)))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = os.path.join(tmp, 'seed.sqlite3')
+        os.environ.update(
+            BENCH_DB=seed_path, BENCH_DB_ENGINE=ENGINES['stock'],
+            DJANGO_SETTINGS_MODULE='bench_settings')
+        setup_django()
+        from common import seed_database
+
+        seed_database(posts=POSTS)
+        results = {}
+        for scenario, engine in ENGINES.items():
+            # Режим WAL сохраняется в файле, поэтому у сценария своя копия.
+            path = os.path.join(tmp, f'{scenario}.sqlite3')
+            shutil.copy(seed_path, path)
+            env = dict(os.environ, BENCH_DB=path, BENCH_DB_ENGINE=engine)
+            output = subprocess.run(
+                [sys.executable, __file__, 'child'],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[scenario] = json.loads(output.splitlines()[-1])
+    print(f'{READERS} читателей, {WRITERS} писателей, {DURATION} с')
+    print(f'{"":<8} {"kind":<6} {"rps":>8} {"p50, ms":>8} {"p99, ms":>8}'
+          f' {"errors":>7}')
+    for scenario, result in results.items():
+        for kind, values in result.items():
+            print(f'{scenario:<8} {kind:<6} {values["rps"]:>8.1f}'
+                  f' {values["p50"]:>8.1f} {values["p99"]:>8.1f}'
+                  f' {values["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child()
+    else:
+        main()
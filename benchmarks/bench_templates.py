@@ -0,0 +1,93 @@
+"""Время первого и сотого запроса к страницам в новом процессе.
+
+Каждый сценарий запускается в отдельном интерпретаторе, чтобы кэш
+шаблонов был пуст:
+
+* ``cold`` — процесс без предварительной загрузки шаблонов;
+* ``preloaded`` — процесс, импортировавший ``blogicum.wsgi``, который
+  компилирует все шаблоны при старте.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import setup_django
+
+URLS = (
+    '/',
+    '/category/bench/',
+    '/profile/bench_user_0/',
+    '/posts/1/',
+    '/pages/about/',
+    '/auth/login/',
+)
+RUNS = 5
+WARM_REQUESTS = 100
+
+
+def child(scenario):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    setup_django()
+    if scenario == 'preloaded':
+        import blogicum.wsgi  # noqa: F401
+    from django.conf import settings
+    from django.test import Client
+
+    settings.PAGE_CACHE_TTL = {}
+    client = Client()
+    result = {}
+    for url in URLS:
+        start = time.perf_counter()
+        assert client.get(url).status_code == 200, url
+        first = (time.perf_counter() - start) * 1000
+        for _ in range(WARM_REQUESTS - 1):
+            start = time.perf_counter()
+            client.get(url)
+        warm = (time.perf_counter() - start) * 1000
+        result[url] = (first, warm)
+    print(json.dumps(result))
+
+
+def run_child(scenario, env):
+    output = subprocess.run(
+        [sys.executable, __file__, scenario],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BENCH_DB=os.path.join(tmp, 'bench.sqlite3'))
+        os.environ.update(env)
+        os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+        setup_django()
+        from common import seed_database
+
+        seed_database()
+        # Первый запрос процесса включает импорт URLConf и представлений,
+        # поэтому сравниваются все страницы по порядку.
+        results = {
+            scenario: [run_child(scenario, env) for _ in range(RUNS)]
+            for scenario in ('cold', 'preloaded')
+        }
+    print(f'{"url":<24} {"cold 1st":>9} {"preload 1st":>12} {"100th":>7}'
+          '  (медиана, мс)')
+    for url in URLS:
+        def median(scenario, index):
+            values = sorted(run[url][index] for run in results[scenario])
+            return values[len(values) // 2]
+
+        print(f'{url:<24} {median("cold", 0):>9.2f}'
+              f' {median("preloaded", 0):>12.2f}'
+              f' {median("preloaded", 1):>7.2f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
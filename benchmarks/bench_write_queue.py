@@ -0,0 +1,94 @@
+"""Пропускная способность добавления комментариев с очередью записи.
+
+``WRITERS`` потоков одного процесса непрерывно добавляют комментарии;
+сценарии запускаются в отдельных интерпретаторах на копиях одной базы:
+
+* ``direct`` — каждый запрос пишет в базу сам;
+* ``queued`` — записи выполняет поток-писатель (``WRITE_QUEUE_ENABLED``).
+
+Отказы — ``OperationalError`` («database is locked») и ответы 503
+очереди записи. Бэкенд базы задаёт переменная ``BENCH_DB_ENGINE``.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from common import run_load, setup_django
+
+SCENARIOS = ('direct', 'queued')
+WRITERS = 32
+DURATION = 10
+POSTS = 200
+
+
+class Rejected(Exception):
+    pass
+
+
+def writer(user, index):
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+
+    def request(step):
+        url = f'/posts/{(index * 31 + step) % POSTS + 1}/comment/'
+        response = client.post(url, {'text': f'Комментарий {step}'})
+        if response.status_code == 503:
+            raise Rejected
+        assert response.status_code == 302, url
+
+    return request
+
+
+def child(scenario):
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'bench_settings'
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError
+
+    settings.WRITE_QUEUE_ENABLED = scenario == 'queued'
+    users = list(get_user_model().objects.order_by('id'))
+    workers = [
+        ('write', writer(users[index % len(users)], index))
+        for index in range(WRITERS)
+    ]
+    result = run_load(workers, DURATION, (OperationalError, Rejected))
+    print(json.dumps(result['write']))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_path = os.path.join(tmp, 'seed.sqlite3')
+        os.environ.update(
+            BENCH_DB=seed_path, DJANGO_SETTINGS_MODULE='bench_settings')
+        setup_django()
+        from common import seed_database
+
+        seed_database(posts=POSTS)
+        results = {}
+        for scenario in SCENARIOS:
+            path = os.path.join(tmp, f'{scenario}.sqlite3')
+            shutil.copy(seed_path, path)
+            env = dict(os.environ, BENCH_DB=path)
+            output = subprocess.run(
+                [sys.executable, __file__, scenario],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+            results[scenario] = json.loads(output.splitlines()[-1])
+    print(f'{WRITERS} писателей, {DURATION} с')
+    print(f'{"":<8} {"rps":>8} {"p50, ms":>8} {"p99, ms":>8} {"errors":>7}')
+    for scenario, values in results.items():
+        print(f'{scenario:<8} {values["rps"]:>8.1f} {values["p50"]:>8.1f}'
+              f' {values["p99"]:>8.1f} {values["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        child(sys.argv[1])
+    else:
+        main()
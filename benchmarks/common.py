@@ -0,0 +1,134 @@
+"""Общая настройка Django для скриптов замеров.
+
+Скрипты запускаются из корня репозитория:
+``python benchmarks/bench_paginator.py``.
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django(settings_module='blogicum.settings'):
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+
+    django.setup()
+
+
+def seed_database(posts=200, comments_per_post=5):
+    """Применяет миграции и заполняет базу BENCH_DB тестовыми данными."""
+    from datetime import timedelta
+
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    call_command('migrate', verbosity=0)
+    from blog.models import Category, Comment, Location, Post
+
+    user_model = get_user_model()
+    users = [
+        user_model.objects.create_user(f'bench_user_{i}', password='bench')
+        for i in range(5)
+    ]
+    category = Category.objects.create(
+        title='Замеры', description='Категория для замеров', slug='bench')
+    location = Location.objects.create(name='Стенд')
+    now = timezone.now()
+    Post.objects.bulk_create(
+        Post(
+            title=f'Публикация {i}',
+            text='Текст публикации для замеров. ' * 20,
+            pub_date=now - timedelta(minutes=i + 1),
+            author=users[i % len(users)],
+            category=category,
+            location=location,
+        )
+        for i in range(posts)
+    )
+    Comment.objects.bulk_create(
+        Comment(post=post, author=users[i % len(users)], text='Комментарий')
+        for post in Post.objects.all()
+        for i in range(comments_per_post)
+    )
+    call_command('recount_comments', stdout=open(os.devnull, 'w'))
+    # Закрытие соединения переносит журнал WAL в файл базы, и её можно
+    # копировать.
+    from django.db import connection
+
+    connection.close()
+
+
+def timeit(func, repeat=50):
+    """Медиана времени вызова ``func`` в миллисекундах."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_load(workers, duration, errors=()):
+    """Нагрузка из потоков ``workers`` в течение ``duration`` секунд.
+
+    ``workers`` — пары ``(вид, request)``; поток вызывает
+    ``request(step)`` в цикле, исключения из ``errors`` считаются
+    отказами. Возвращает для каждого вида число успешных запросов
+    в секунду, 50-й и 99-й перцентили времени ответа (мс) и число
+    отказов.
+    """
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {
+        kind: {'ok': 0, 'errors': 0, 'latency': []}
+        for kind, _ in workers
+    }
+
+    def loop(kind, request):
+        step = 0
+        while not stop.is_set():
+            step += 1
+            started = time.perf_counter()
+            try:
+                request(step)
+            except errors:
+                with lock:
+                    stats[kind]['errors'] += 1
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                stats[kind]['ok'] += 1
+                stats[kind]['latency'].append(elapsed)
+
+    threads = [
+        threading.Thread(target=loop, args=worker) for worker in workers
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return {
+        kind: {
+            'rps': values['ok'] / duration,
+            'p50': percentile(values['latency'], 0.5),
+            'p99': percentile(values['latency'], 0.99),
+            'errors': values['errors'],
+        }
+        for kind, values in stats.items()
+    }
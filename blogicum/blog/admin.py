@@ -1,9 +1,61 @@
 from django.contrib import admin
+from django.http import StreamingHttpResponse
 
+from .dumps import (
+    EXPORT_FORMATS, format_csv, format_ndjson, get_export_fields, iter_rows
+)
 from .models import Category, Post, Location, Comment
+from .search import build_match_query, fts_available, matching_ids
+
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+# Хэши паролей не покидают базу через админку.
+EXPORT_EXCLUDE = ('password',)
+
+
+def make_export_action(export_format):
+    """Действие админки, отдающее выбранные строки файлом потоком."""
+
+    def export(modeladmin, request, queryset):
+        model = queryset.model
+        fields = get_export_fields(model, exclude=EXPORT_EXCLUDE)
+        rows = iter_rows(queryset, fields)
+        if export_format == 'csv':
+            lines = format_csv(rows, fields)
+        else:
+            lines = format_ndjson(rows)
+        response = StreamingHttpResponse(
+            lines, content_type=EXPORT_CONTENT_TYPES[export_format])
+        filename = model._meta.model_name + EXPORT_FORMATS[export_format]
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"')
+        return response
+
+    export.short_description = (
+        f'Выгрузить выбранные записи в {export_format.upper()}')
+    return export
+
+
+for export_format in EXPORT_FORMATS:
+    admin.site.add_action(
+        make_export_action(export_format), f'export_{export_format}')
+
+
+class PostAdmin(admin.ModelAdmin):
+    search_fields = ('title', 'text')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по индексу FTS5 вместо icontains по всей таблице."""
+        if not (fts_available(queryset.db)
+                and build_match_query(search_term)):
+            return super().get_search_results(
+                request, queryset, search_term)
+        return queryset.filter(id__in=matching_ids(search_term)), False
 
 
 admin.site.register(Category)
 admin.site.register(Location)
-admin.site.register(Post)
+admin.site.register(Post, PostAdmin)
 admin.site.register(Comment)
@@ -0,0 +1,154 @@
+"""Read-only JSON API ленты, категорий, профилей и публикаций.
+
+Строки сериализуются напрямую из ``values()``, без создания моделей;
+правила видимости те же, что у HTML-страниц (``get_default_queryset``).
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import urlencode
+from django.views import View
+
+from .models import Category, User
+from .paginators import CursorPaginator
+from .views import get_default_queryset
+
+POST_FIELDS = (
+    'id',
+    'title',
+    'text',
+    'pub_date',
+    'comment_count',
+    'image',
+    'author__username',
+    'category__slug',
+    'category__title',
+    'location__name',
+    'location__is_published',
+)
+
+
+def serialize_post(row):
+    location = row['location__name'] if row['location__is_published'] else None
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'text': row['text'],
+        'pub_date': row['pub_date'],
+        'comment_count': row['comment_count'],
+        'image': default_storage.url(row['image']) if row['image'] else None,
+        'author': row['author__username'],
+        'category': {
+            'slug': row['category__slug'],
+            'title': row['category__title'],
+        },
+        'location': location,
+    }
+
+
+class ApiView(View):
+    """Базовый класс: JSON-ответ со строгим ETag и ответом 304."""
+
+    http_method_names = ['get', 'head', 'options']
+
+    def get_data(self):
+        raise NotImplementedError(
+            'Определите get_data() в классе представления API')
+
+    def get(self, request, *args, **kwargs):
+        body = json.dumps(
+            self.get_data(), cls=DjangoJSONEncoder, ensure_ascii=False
+        ).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        return response
+
+
+class PostPageApiView(ApiView):
+    """Страница публикаций с курсором по (pub_date, id)."""
+
+    def get_queryset(self):
+        return get_default_queryset(True, False)
+
+    def get_page_url(self, **params):
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{urlencode(params)}')
+
+    def get_extra_data(self):
+        return {}
+
+    def get_data(self):
+        paginator = CursorPaginator(
+            self.get_queryset().values(*POST_FIELDS),
+            settings.API_PAGE_SIZE)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return {
+            **self.get_extra_data(),
+            'results': [serialize_post(row) for row in page],
+            'next': page.next_cursor and self.get_page_url(
+                after=page.next_cursor),
+            'previous': page.previous_cursor and self.get_page_url(
+                before=page.previous_cursor),
+        }
+
+
+class FeedApiView(PostPageApiView):
+    pass
+
+
+class CategoryListApiView(ApiView):
+    def get_data(self):
+        return {'results': list(
+            Category.objects.filter(is_published=True).order_by(
+                'title').values('slug', 'title', 'description')
+        )}
+
+
+class CategoryPostsApiView(PostPageApiView):
+    def get_queryset(self):
+        self.category = get_object_or_404(
+            Category.objects.values('id', 'slug', 'title', 'description'),
+            slug=self.kwargs['category_slug'],
+            is_published=True)
+        return super().get_queryset().filter(category=self.category['id'])
+
+    def get_extra_data(self):
+        category = dict(self.category)
+        del category['id']
+        return {'category': category}
+
+
+class ProfileApiView(PostPageApiView):
+    def get_queryset(self):
+        self.profile = get_object_or_404(
+            User.objects.values(
+                'id', 'username', 'first_name', 'last_name', 'date_joined'),
+            username=self.kwargs['username'])
+        return super().get_queryset().filter(author=self.profile['id'])
+
+    def get_extra_data(self):
+        profile = dict(self.profile)
+        del profile['id']
+        return {'profile': profile}
+
+
+class PostApiView(ApiView):
+    def get_data(self):
+        return serialize_post(get_object_or_404(
+            get_default_queryset(True, False).values(*POST_FIELDS),
+            id=self.kwargs['post_id']))
@@ -0,0 +1,28 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path(
+        'posts/',
+        api.FeedApiView.as_view(),
+        name='feed'),
+    path(
+        'posts/<int:post_id>/',
+        api.PostApiView.as_view(),
+        name='post_detail'),
+    path(
+        'categories/',
+        api.CategoryListApiView.as_view(),
+        name='categories'),
+    path(
+        'categories/<slug:category_slug>/posts/',
+        api.CategoryPostsApiView.as_view(),
+        name='category_posts'),
+    path(
+        'profiles/<str:username>/',
+        api.ProfileApiView.as_view(),
+        name='profile'),
+]
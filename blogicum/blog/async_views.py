@@ -0,0 +1,59 @@
+"""Асинхронные представления для ASGI.
+
+Под ASGI синхронное представление выполняется в общем потоке
+``sync_to_async(thread_sensitive=True)``, и одновременные запросы
+обрабатываются по очереди. Здесь ``dispatch()`` и рендеринг шаблона
+синхронного представления выполняются в отдельном пуле из
+``ASYNC_VIEW_THREADS`` потоков, а цикл событий только ждёт результат.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.ASYNC_VIEW_THREADS,
+                thread_name_prefix='blog-view')
+        return _executor
+
+
+def _render_view(view, request, args, kwargs):
+    # Потоки пула не получают request_started/request_finished, поэтому
+    # соединения с базой закрываются здесь, как после запроса WSGI.
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def as_async_view(view_class, **initkwargs):
+    """Асинхронное представление из класса-представления ``view_class``.
+
+    Используется для лент и страницы публикации при ``ASYNC_VIEWS``.
+    """
+    view = view_class.as_view(**initkwargs)
+
+    async def async_view(request, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_executor(),
+            functools.partial(_render_view, view, request, args, kwargs))
+
+    async_view.view_class = view_class
+    async_view.view_initkwargs = initkwargs
+    return async_view
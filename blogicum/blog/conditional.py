@@ -0,0 +1,144 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Post
+from .page_cache import get_tag_versions, invalidate_tags
+from .reference_cache import categories, locations
+from .utils import publication_now
+
+# Теги валидаторов списков публикаций. Их версии — время последнего
+# изменения (см. ``page_cache.invalidate_tags``); сбрасывают их сигналы
+# из ``signals``. Изменения комментариев, пользователей и справочников,
+# а также загрузка данных командами без сигналов затрагивают все списки.
+LIST_COMMENTS_TAG = 'list:comments'
+LIST_USERS_TAG = 'list:users'
+LIST_BULK_TAG = 'list:bulk'
+COMMON_LIST_TAGS = (
+    LIST_COMMENTS_TAG,
+    LIST_USERS_TAG,
+    LIST_BULK_TAG,
+    categories.tag,
+    locations.tag,
+)
+SCHEDULE_KEY = 'blog.conditional.schedule'
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified до основной работы представления.
+
+    Валидаторы строятся из ``get_last_modified()`` и ``get_etag_parts()``,
+    которые не должны обходить таблицы. В ETag также входят пользователь
+    и полный путь запроса, так как от них зависит разметка, а для
+    вошедшего пользователя — секрет CSRF: формы страницы содержат токен,
+    и после повторного входа прежняя копия страницы уже не годится.
+    """
+
+    def get_last_modified(self):
+        return None
+
+    def get_etag_parts(self):
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().dispatch(request, *args, **kwargs)
+        parts = (
+            last_modified.isoformat(),
+            request.user.pk,
+            request.get_full_path(),
+            (request.META.get('CSRF_COOKIE')
+             if request.user.is_authenticated else None),
+            *self.get_etag_parts(),
+        )
+        etag = quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+@lru_cache(maxsize=None)
+def get_template_mtime(template_name):
+    """Время изменения файла шаблона; определяется один раз на процесс."""
+    origin = get_template(template_name).origin.name
+    return datetime.fromtimestamp(
+        Path(origin).stat().st_mtime, tz=timezone.utc)
+
+
+def post_list_tags(post):
+    """Теги списков, в которых показывается публикация.
+
+    Значения берутся из ``__dict__``, чтобы не загружать отложенные поля.
+    """
+    values = post.__dict__
+    tags = {'list:feed', f'list:user:{values.get("author_id")}'}
+    if values.get('category_id'):
+        tags.add(f'list:category:{values["category_id"]}')
+    return tags
+
+
+def get_publication_marker():
+    """Момент, когда в последний раз вышла отложенная публикация.
+
+    Отложенные публикации появляются в списках без сигналов. В кэше
+    хранится дата ближайшей из них; пока она не наступила, запросов к
+    базе нет, после неё дата ищется по индексу ленты и отметка
+    сдвигается. Сохранение публикации удаляет запись (см. ``signals``).
+    """
+    now = publication_now()
+    schedule = cache.get(SCHEDULE_KEY)
+    if schedule is None or (
+            schedule['next'] is not None and schedule['next'] <= now):
+        schedule = {
+            'marker': now,
+            'next': Post.objects.filter(
+                is_published=True, pub_date__gt=now,
+            ).order_by('pub_date').values_list(
+                'pub_date', flat=True).first(),
+        }
+        cache.set(SCHEDULE_KEY, schedule, None)
+    return schedule['marker']
+
+
+def invalidate_post_lists():
+    """Сбрасывает валидаторы всех списков после вставки без сигналов."""
+    invalidate_tags(LIST_BULK_TAG, 'feed')
+    cache.delete(SCHEDULE_KEY)
+
+
+def get_tag_time(tag):
+    """Момент последнего сброса тега и его версия."""
+    version = get_tag_versions([tag])[tag]
+    return datetime.fromtimestamp(version / 10 ** 9, tz=timezone.utc), version
+
+
+def get_list_validators(tags):
+    """Last-Modified и версии тегов списка публикаций.
+
+    Ни число строк, ни агрегаты по таблице не нужны: любое изменение,
+    затрагивающее список, меняет версию одного из его тегов или
+    ``COMMON_LIST_TAGS``, а выход отложенной публикации — отметку
+    ``get_publication_marker()``.
+    """
+    versions = get_tag_versions([*tags, *COMMON_LIST_TAGS])
+    changed_at = datetime.fromtimestamp(
+        max(versions.values()) / 10 ** 9, tz=timezone.utc)
+    marker = get_publication_marker()
+    return max(changed_at, marker), (
+        marker.isoformat(), *sorted(versions.items()))
@@ -0,0 +1,258 @@
+"""Потоковое чтение и запись дампов базы данных."""
+import csv
+import gzip
+import itertools
+import json
+import os
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+READ_SIZE = 1 << 16
+EXPORT_CHUNK_SIZE = 2000
+
+
+def open_dump(path, mode='rt'):
+    """Открывает файл дампа; ``.gz`` распаковывается на лету."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class _ArrayReader:
+    """Разбор JSON-массива из потока с буфером ограниченного размера."""
+
+    def __init__(self, stream, read_size):
+        self.stream = stream
+        self.read_size = read_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+
+    def read_more(self, size):
+        chunk = self.stream.read(size)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def next_char(self):
+        """Следующий непробельный символ; позиция на нём."""
+        while True:
+            while (self.position < len(self.buffer)
+                   and self.buffer[self.position].isspace()):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more(self.read_size):
+                raise ValueError('Неожиданный конец JSON-массива')
+
+    def is_complete(self, end):
+        # Число, прочитанное до конца буфера или до «.»/«e», может
+        # продолжаться в файле.
+        return end < len(self.buffer) and (
+            self.buffer[end].isspace() or self.buffer[end] in ',]')
+
+    def value(self):
+        size = self.read_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position)
+            except json.JSONDecodeError:
+                # Элемент прочитан не полностью.
+                if not self.read_more(size):
+                    raise
+                size *= 2
+                continue
+            if self.is_complete(end) or not self.read_more(size):
+                break
+        self.position = end
+        if self.position > self.read_size:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        return value
+
+    def __iter__(self):
+        if self.next_char() != '[':
+            raise ValueError('Дамп должен быть JSON-массивом')
+        self.position += 1
+        if self.next_char() == ']':
+            return
+        while True:
+            self.next_char()
+            yield self.value()
+            char = self.next_char()
+            self.position += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f'Ожидалась запятая, найдено {char!r}')
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """Элементы JSON-массива из текстового потока по одному.
+
+    В памяти находится только текущий элемент и непрочитанный остаток
+    буфера, поэтому размер файла не ограничен.
+    """
+    return iter(_ArrayReader(stream, read_size))
+
+
+def insert_raw(model, objs, using):
+    """Вставляет объекты пачками, как ``bulk_create()``.
+
+    В отличие от ``bulk_create()`` значения полей ``auto_now`` и
+    ``auto_now_add`` берутся из объектов, как в ``loaddata``, и
+    заполняются текущим временем, только если в дампе их нет. Сигналы
+    не отправляются.
+    """
+    from django.db import connections
+
+    if not objs:
+        return
+    fields = [
+        field for field in model._meta.local_concrete_fields
+        if objs[0].pk is not None or field is not model._meta.pk
+    ]
+    for field in fields:
+        if getattr(field, 'auto_now', False) or getattr(
+                field, 'auto_now_add', False):
+            for obj in objs:
+                if getattr(obj, field.attname) is None:
+                    field.pre_save(obj, add=True)
+    batch_size = connections[using].ops.bulk_batch_size(fields, objs)
+    manager = model._base_manager.using(using)
+    for start in range(0, len(objs), batch_size):
+        manager._insert(
+            objs[start:start + batch_size], fields=fields, raw=True,
+            using=using)
+
+
+def prepare_rows(model, rows, connection):
+    """Словари значений полей в кортежи для ``insert_rows()``.
+
+    Значения приводятся к виду базы, как при ``bulk_create()``; поля,
+    которых нет в словаре, получают значение по умолчанию. Запросов к
+    базе нет, поэтому строки можно готовить в других процессах.
+    """
+    fields = model._meta.local_concrete_fields
+    return [
+        tuple(
+            field.get_db_prep_save(
+                row[field.attname] if field.attname in row
+                else field.get_default(),
+                connection)
+            for field in fields)
+        for row in rows
+    ]
+
+
+def insert_rows(model, rows, using):
+    """Вставляет кортежи ``prepare_rows()`` одним ``executemany``.
+
+    Компиляция запроса на каждый объект, которая занимает основное
+    время ``bulk_create()``, здесь не нужна. Сигналы не отправляются.
+    """
+    from django.db import connections
+
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    fields = model._meta.local_concrete_fields
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote_name(model._meta.db_table),
+        ', '.join(quote_name(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)))
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def get_export_fields(model, exclude=()):
+    """Имена столбцов выгрузки: все хранимые поля модели."""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if field.attname not in exclude
+    ]
+
+
+def iter_rows(queryset, fields, chunk_size=EXPORT_CHUNK_SIZE):
+    """Строки ``queryset`` словарями ``values()`` в порядке pk.
+
+    ``iterator()`` не кэширует результат, поэтому в памяти находится
+    одна порция из ``chunk_size`` строк.
+    """
+    return queryset.order_by('pk').values(*fields).iterator(
+        chunk_size=chunk_size)
+
+
+def _encode_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def format_ndjson(rows):
+    """Строки NDJSON: по объекту JSON на строку."""
+    for row in rows:
+        yield json.dumps(
+            row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def format_csv(rows, fields):
+    """Строки CSV; первая — заголовок с именами полей."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            [_encode_value(row[field]) for field in fields])
+
+
+EXPORT_FORMATS = {
+    'ndjson': '.ndjson',
+    'csv': '.csv',
+}
+
+
+def _open_export(path, compress):
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def write_export(rows, fields, directory, name, export_format='ndjson',
+                 compress=False, shard_size=0):
+    """Записывает строки в файлы ``name[-NNNNN].<формат>[.gz]``.
+
+    При ``shard_size`` каждые ``shard_size`` строк пишутся в отдельный
+    файл, у CSV — со своим заголовком. Пустая таблица даёт один файл.
+    Возвращает пути созданных файлов.
+    """
+    extension = EXPORT_FORMATS[export_format] + ('.gz' if compress else '')
+    rows = iter(rows)
+    paths = []
+    while True:
+        shard = itertools.islice(rows, shard_size) if shard_size else rows
+        first = next(shard, None)
+        if first is None and paths:
+            break
+        if first is not None:
+            shard = itertools.chain((first,), shard)
+        number = f'-{len(paths) + 1:05d}' if shard_size else ''
+        path = os.path.join(directory, f'{name}{number}{extension}')
+        paths.append(path)
+        if export_format == 'csv':
+            lines = format_csv(shard, fields)
+        else:
+            lines = format_ndjson(shard)
+        with _open_export(path, compress) as output:
+            output.writelines(lines)
+        if not shard_size:
+            break
+    return paths
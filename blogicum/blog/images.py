@@ -0,0 +1,169 @@
+import posixpath
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_CACHE_PREFIX = 'post-image:'
+PENDING = 'pending'
+
+SAVE_FORMATS = ('JPEG', 'PNG', 'WEBP')
+
+EXIF_ORIENTATION = 0x0112
+# Значения ориентации, при которых exif_transpose меняет ширину и высоту.
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+IMAGE_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def get_variant_widths():
+    """Ширины вариантов: размер карточки и детальной страницы и их 2x."""
+    widths = set()
+    for options in settings.POST_IMAGE_VARIANTS.values():
+        widths.update((options['width'], options['width'] * 2))
+    return sorted(widths)
+
+
+def get_variant_name(name, width):
+    root, ext = posixpath.splitext(name)
+    return f'{root}_{width}w{ext}'
+
+
+def get_variant_size(size, width):
+    """Размер варианта; изображения не увеличиваются."""
+    original_width, original_height = size
+    if width >= original_width:
+        return original_width, original_height
+    return width, max(1, round(original_height * width / original_width))
+
+
+def _cache_key(name):
+    return IMAGE_CACHE_PREFIX + name
+
+
+def _resize(image, size, format_name):
+    resized = image.resize(size, Image.LANCZOS)
+    if format_name == 'JPEG' and resized.mode not in ('RGB', 'L'):
+        resized = resized.convert('RGB')
+    buffer = ContentFile(b'')
+    resized.save(buffer, format_name, optimize=True, quality=85)
+    return buffer
+
+
+def _variant_sizes(original):
+    for width in get_variant_widths():
+        size = get_variant_size(original, width)
+        if size != original:
+            yield size
+
+
+def read_image_size(file):
+    """Размер изображения после поворота по EXIF без декодирования.
+
+    Pillow при открытии читает только заголовок, в котором есть и размер,
+    и тег ориентации.
+    """
+    with Image.open(file) as image:
+        width, height = image.size
+        orientation = image.getexif().get(EXIF_ORIENTATION)
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def generate_variants(name, storage=default_storage):
+    """Создаёт недостающие варианты рядом с оригиналом.
+
+    Возвращает описание изображения: размер оригинала и имена вариантов
+    по ширине, или ``None``, если файл не удаётся открыть как изображение.
+    """
+    try:
+        with storage.open(name) as file, Image.open(file) as image:
+            format_name = (
+                image.format if image.format in SAVE_FORMATS else 'JPEG')
+            image = ImageOps.exif_transpose(image)
+            original = image.size
+            variants = {}
+            for size in _variant_sizes(original):
+                variant = get_variant_name(name, size[0])
+                if not storage.exists(variant):
+                    variant = storage.save(
+                        variant, _resize(image, size, format_name))
+                variants[size[0]] = variant
+    except IMAGE_ERRORS:
+        return None
+    return {'size': original, 'variants': variants}
+
+
+def find_variants(name, storage=default_storage):
+    """Описание изображения, если все варианты уже созданы, иначе ``None``.
+
+    Изображение не декодируется: размер берётся из заголовка.
+    """
+    if not storage.exists(name):
+        return None
+    try:
+        with storage.open(name) as file:
+            original = read_image_size(file)
+    except IMAGE_ERRORS:
+        return None
+    variants = {}
+    for size in _variant_sizes(original):
+        variant = get_variant_name(name, size[0])
+        if not storage.exists(variant):
+            return None
+        variants[size[0]] = variant
+    return {'size': original, 'variants': variants}
+
+
+def store_variants(name, info):
+    cache.set(_cache_key(name), info, None)
+
+
+def get_image_info(image):
+    """Описание готовых вариантов; сами варианты создаёт фоновая задача.
+
+    Пока вариантов нет, в кэше лежит отметка ``PENDING`` на
+    ``POST_IMAGE_PENDING_TIMEOUT`` секунд, чтобы отрисовка не проверяла
+    файлы на каждом запросе; задача заменяет её описанием.
+    """
+    if not image:
+        return None
+    info = cache.get(_cache_key(image.name))
+    if info is None:
+        info = find_variants(image.name, image.storage)
+        if info is None:
+            cache.set(_cache_key(image.name), PENDING,
+                      settings.POST_IMAGE_PENDING_TIMEOUT)
+            return None
+        store_variants(image.name, info)
+    if info == PENDING:
+        return None
+    return info
+
+
+def get_responsive_image(image, kind):
+    """Атрибуты ``<img>`` для варианта ``kind`` из POST_IMAGE_VARIANTS."""
+    info = get_image_info(image)
+    if info is None:
+        return {'src': image.url}
+    options = settings.POST_IMAGE_VARIANTS[kind]
+    size = info['size']
+    storage = image.storage
+    candidates = []
+    for width in (options['width'], options['width'] * 2):
+        variant_width = get_variant_size(size, width)[0]
+        name = info['variants'].get(variant_width, image.name)
+        candidate = (storage.url(name), variant_width)
+        if candidate not in candidates:
+            candidates.append(candidate)
+    width, height = get_variant_size(size, options['width'])
+    return {
+        'src': candidates[0][0],
+        'srcset': ', '.join(f'{url} {w}w' for url, w in candidates),
+        'sizes': options['sizes'],
+        'width': width,
+        'height': height,
+    }
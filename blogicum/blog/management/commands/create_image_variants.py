@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_variants, store_variants
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = ('Создаёт уменьшенные варианты для уже загруженных изображений '
+            'публикаций.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество процессов; 1 — без пула процессов.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=16,
+            help='Количество изображений в одной задаче пула.')
+
+    def handle(self, *args, **options):
+        names = list(Post.objects.exclude(image='').order_by().values_list(
+            'image', flat=True).distinct())
+        workers = options['workers']
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            results = executor.map(
+                generate_variants, names, chunksize=options['chunk_size'])
+        else:
+            executor = None
+            results = map(generate_variants, names)
+        processed = failed = 0
+        try:
+            for name, info in zip(names, results):
+                if info is None:
+                    failed += 1
+                    self.stderr.write(f'Не удалось обработать {name}')
+                    continue
+                store_variants(name, info)
+                processed += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано изображений: {processed}, ошибок: {failed}'))
@@ -0,0 +1,76 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog.dumps import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    get_export_fields,
+    iter_rows,
+    write_export,
+)
+from blog.models import Category, Comment, Location, Post
+
+EXPORT_MODELS = {
+    'categories': Category,
+    'locations': Location,
+    'users': get_user_model(),
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = ('Выгружает публикации, комментарии, категории, '
+            'местоположения и пользователей в NDJSON или CSV потоком, '
+            'по файлу на таблицу.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tables',
+            nargs='*',
+            choices=[*EXPORT_MODELS, []],
+            help='Таблицы для выгрузки; по умолчанию все.')
+        parser.add_argument(
+            '--output-dir',
+            default='.',
+            help='Каталог для файлов выгрузки.')
+        parser.add_argument(
+            '--format',
+            choices=list(EXPORT_FORMATS),
+            default='ndjson',
+            help='Формат файлов.')
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Сжимать файлы gzip.')
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            default=0,
+            help='Количество строк в одном файле; 0 — один файл.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за раз.')
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for name in options['tables'] or EXPORT_MODELS:
+            model = EXPORT_MODELS[name]
+            fields = get_export_fields(model)
+            paths = write_export(
+                iter_rows(
+                    model._base_manager.all(), fields,
+                    options['chunk_size']),
+                fields,
+                options['output_dir'],
+                name,
+                export_format=options['format'],
+                compress=options['gzip'],
+                shard_size=options['shard_size'],
+            )
+            self.stdout.write(f'{name}: {", ".join(paths)}')
+        self.stdout.write(self.style.SUCCESS('Выгрузка завершена'))
@@ -0,0 +1,218 @@
+import multiprocessing
+import os
+from array import array
+from collections import deque
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog import synthetic
+from blog.conditional import invalidate_post_lists
+from blog.dumps import insert_rows
+from blog.models import Category, Comment, Location, Post
+from blog.reference_cache import categories, locations
+from blog.search import fts_available
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими пользователями, категориями, '
+            'местоположениями, публикациями и комментариями для '
+            'нагрузочных замеров. Строки собираются в пуле процессов, '
+            'одинаковый --seed на той же базе даёт те же данные с точностью '
+            'до дат, которые отсчитываются от момента запуска.')
+
+    def add_arguments(self, parser):
+        for name, default in (('users', 1000), ('categories', 20),
+                              ('locations', 50), ('posts', 10000),
+                              ('comments', 100000)):
+            parser.add_argument(
+                f'--{name}',
+                type=int,
+                default=default,
+                help=f'Сколько строк добавить в таблицу {name}.')
+        parser.add_argument(
+            '--future-share',
+            type=float,
+            default=0.05,
+            help='Доля отложенных публикаций с датой в будущем.')
+        parser.add_argument(
+            '--unpublished-share',
+            type=float,
+            default=0.05,
+            help='Доля снятых с публикации записей.')
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=0.9,
+            help=('Показатель закона Ципфа для выбора авторов, категорий '
+                  'и публикаций под комментарии.'))
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='За сколько дней в прошлое разбросаны даты.')
+        parser.add_argument(
+            '--password',
+            help=('Пароль всех созданных пользователей; по умолчанию '
+                  'вход под ними невозможен.'))
+        parser.add_argument(
+            '--locale',
+            default='ru_RU',
+            help='Локаль Faker.')
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Сид генератора случайных чисел.')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Количество процессов; 1 — без пула.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Количество строк в одной порции и транзакции.')
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Псевдоним базы данных.')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.using = options['database']
+        password = options['password']
+        context = {
+            'using': self.using,
+            'seed': options['seed'],
+            'locale': options['locale'],
+            'now': timezone.now(),
+            'days': options['days'],
+            'skew': options['skew'],
+            'future_share': options['future_share'],
+            'unpublished_share': options['unpublished_share'],
+            'password': (
+                make_password(password) if password is not None
+                else f'{UNUSABLE_PASSWORD_PREFIX}generated'),
+        }
+        self.generate(User, synthetic.make_users, 'users', context)
+        self.generate(
+            Category, synthetic.make_categories, 'categories', context)
+        self.generate(
+            Location, synthetic.make_locations, 'locations', context)
+        if options['posts']:
+            self.generate(Post, synthetic.make_posts, 'posts', {
+                **context,
+                'user_ids': self.existing_ids(User),
+                'category_ids': self.existing_ids(Category),
+                'location_ids': self.ids(Location),
+            })
+        if options['comments']:
+            self.generate(Comment, synthetic.make_comments, 'comments', {
+                **context,
+                'user_ids': self.existing_ids(User),
+                'past_posts': self.past_posts(context['now']),
+            })
+        self.reset_sequences()
+        self.refresh_derived_data()
+        self.stdout.write(self.style.SUCCESS('Генерация завершена'))
+
+    def ids(self, model):
+        return array('q', model._base_manager.using(
+            self.using).order_by('pk').values_list('pk', flat=True))
+
+    def existing_ids(self, model):
+        ids = self.ids(model)
+        if not ids:
+            raise CommandError(
+                f'Таблица {model._meta.db_table} пуста: публикациям и '
+                'комментариям не на что ссылаться.')
+        return ids
+
+    def past_posts(self, now):
+        """Идентификаторы и возраст в секундах вышедших публикаций."""
+        post_ids = array('q')
+        ages = array('d')
+        rows = Post.objects.using(self.using).filter(
+            pub_date__lte=now).order_by('pk').values_list('pk', 'pub_date')
+        for pk, pub_date in rows.iterator():
+            post_ids.append(pk)
+            ages.append((now - pub_date).total_seconds())
+        if not post_ids:
+            raise CommandError('Нет вышедших публикаций для комментариев.')
+        return post_ids, ages
+
+    def generate(self, model, make_rows, name, context):
+        count = self.options[name]
+        if not count:
+            return
+        start = (model._base_manager.using(self.using).aggregate(
+            last=Max('pk'))['last'] or 0) + 1
+        chunk_size = self.options['chunk_size']
+        tasks = [
+            (make_rows, model, begin, min(chunk_size, start + count - begin))
+            for begin in range(start, start + count, chunk_size)
+        ]
+        connection = connections[self.using]
+        for rows in self.run(tasks, context):
+            with transaction.atomic(using=self.using):
+                insert_rows(model, rows, self.using)
+            connection.queries_log.clear()
+        self.stdout.write(f'{name}: {count}')
+
+    def run(self, tasks, context):
+        """Порции строк в порядке ``tasks``.
+
+        Пул собирает не больше двух порций на процесс впрок, чтобы
+        память не росла, пока родительский процесс пишет в базу.
+        """
+        workers = self.options['workers']
+        if workers <= 1:
+            synthetic.init_worker(context)
+            for task in tasks:
+                yield synthetic.prepared_chunk(*task)
+            return
+        with multiprocessing.Pool(
+                workers, synthetic.init_worker, (context,)) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(
+                    synthetic.prepared_chunk, task))
+                if len(pending) > 2 * workers:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
+
+    def reset_sequences(self):
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(
+            no_style(), [User, Category, Location, Post, Comment])
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+    def refresh_derived_data(self):
+        """Сигналы при вставке не отправляются: счётчики, поисковый
+        индекс, кэш справочников и валидаторы списков обновляются здесь.
+        """
+        options = {'database': self.using, 'stdout': StringIO()}
+        if self.options['posts'] or self.options['comments']:
+            call_command('recount_comments', **options)
+        if self.options['posts'] and fts_available(self.using):
+            call_command('rebuild_search_index', **options)
+        if self.options['categories']:
+            categories.invalidate()
+        if self.options['locations']:
+            locations.invalidate()
+        invalidate_post_lists()
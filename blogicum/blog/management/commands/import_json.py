@@ -0,0 +1,226 @@
+import itertools
+import json
+import os
+from collections import defaultdict
+from io import StringIO
+
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.conditional import invalidate_post_lists
+from blog.dumps import insert_raw, iter_json_array, open_dump
+from blog.models import Category, Comment, Location, Post
+from blog.reference_cache import categories, locations
+from blog.search import fts_available
+
+
+class Importer:
+    """Вставляет десериализованные объекты порциями по моделям.
+
+    Существующие строки (совпадение по первичному ключу) обновляются,
+    как в ``loaddata``. Внешние ключи каждой порции проверяются одним
+    запросом на поле; ссылки на ещё не загруженные строки копятся в
+    ``pending`` и снимаются, когда эти строки появляются в дампе.
+    """
+
+    def __init__(self, chunk_size, pending, using):
+        self.chunk_size = chunk_size
+        self.using = using
+        self.pending = defaultdict(set, {
+            key: set(values) for key, values in pending.items()})
+        self.buffers = defaultdict(list)
+        self.models = set()
+
+    def load(self, objects):
+        loaded = 0
+        for deserialized in objects:
+            model = type(deserialized.object)
+            buffer = self.buffers[model]
+            buffer.append(deserialized)
+            if len(buffer) >= self.chunk_size:
+                self.flush(model)
+            loaded += 1
+        for model in list(self.buffers):
+            self.flush(model)
+        return loaded
+
+    def flush(self, model):
+        items = self.buffers.pop(model)
+        objs = [item.object for item in items]
+        manager = model._base_manager.using(self.using)
+        existing = set(manager.filter(
+            pk__in=[obj.pk for obj in objs if obj.pk is not None],
+        ).values_list('pk', flat=True))
+        insert_raw(
+            model, [obj for obj in objs if obj.pk not in existing],
+            self.using)
+        updated = [obj for obj in objs if obj.pk in existing]
+        if updated:
+            manager.bulk_update(updated, [
+                field.name for field in model._meta.local_concrete_fields
+                if not field.primary_key
+            ])
+        self.save_m2m(model, items, existing)
+        self.models.add(model)
+        self.resolve(model, objs)
+        self.check_references(model, objs)
+        # При DEBUG журнал запросов хранит SQL вставок целиком.
+        connections[self.using].queries_log.clear()
+
+    def save_m2m(self, model, items, existing):
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            source = field.m2m_field_name() + '_id'
+            target = field.m2m_reverse_field_name() + '_id'
+            through.objects.using(self.using).filter(**{
+                f'{source}__in': existing}).delete()
+            through.objects.using(self.using).bulk_create([
+                through(**{source: item.object.pk, target: value})
+                for item in items
+                for value in item.m2m_data.get(field.name, ())
+            ])
+
+    def resolve(self, model, objs):
+        label = model._meta.label_lower
+        for key in [key for key in self.pending if key[0] == label]:
+            self.pending[key].difference_update(
+                getattr(obj, key[1]) for obj in objs)
+            if not self.pending[key]:
+                del self.pending[key]
+
+    def check_references(self, model, objs):
+        for field in model._meta.local_concrete_fields:
+            if not field.is_relation:
+                continue
+            values = {getattr(obj, field.attname) for obj in objs} - {None}
+            if not values:
+                continue
+            related = field.remote_field.model
+            target = field.target_field.attname
+            found = related._base_manager.using(self.using).filter(**{
+                f'{target}__in': values}).values_list(target, flat=True)
+            missing = values - set(found)
+            if missing:
+                self.pending[(related._meta.label_lower, target)].update(
+                    missing)
+
+
+class Command(BaseCommand):
+    help = ('Загружает дамп в формате JSON (как у dumpdata) потоком: '
+            'файл читается по одному объекту, объекты вставляются '
+            'порциями в нескольких транзакциях. Прерванную загрузку '
+            'можно продолжить с --resume.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump', help='Файл .json или .json.gz.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество объектов одной модели в одной вставке.')
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=100_000,
+            help='Количество объектов в одной транзакции.')
+        parser.add_argument(
+            '--state-file',
+            help='Файл с состоянием загрузки; по умолчанию '
+                 '<dump>.import-state.json.')
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванную загрузку из файла состояния.')
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='База данных для загрузки.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        state_path = (
+            options['state_file'] or f'{options["dump"]}.import-state.json')
+        state = self.read_state(state_path, options['resume'])
+        importer = Importer(
+            options['chunk_size'],
+            {tuple(key.split(':')): values
+             for key, values in state['pending'].items()},
+            using)
+        connection = connections[using]
+        with open_dump(options['dump']) as stream, \
+                connection.constraint_checks_disabled():
+            objects = iter_json_array(stream)
+            # Объекты, загруженные до сбоя, только разбираются.
+            for _ in itertools.islice(objects, state['objects']):
+                pass
+            deserialized = serializers.deserialize(
+                'python', objects, using=using, ignorenonexistent=True)
+            while True:
+                with transaction.atomic(using=using):
+                    loaded = importer.load(itertools.islice(
+                        deserialized, options['transaction_size']))
+                if not loaded:
+                    break
+                state['objects'] += loaded
+                state['pending'] = {
+                    ':'.join(key): sorted(values)
+                    for key, values in importer.pending.items()}
+                self.write_state(state_path, state)
+                self.stdout.write(f'Загружено объектов: {state["objects"]}')
+        if importer.pending:
+            missing = ', '.join(
+                f'{label}.{field}={sorted(values)[:10]}'
+                for (label, field), values in importer.pending.items())
+            raise CommandError(
+                f'Дамп ссылается на отсутствующие строки: {missing}')
+        models = importer.models
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in models])
+        self.reset_sequences(connection, models)
+        self.refresh_derived_data(models, using)
+        os.remove(state_path)
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена, объектов: {state["objects"]}'))
+
+    def read_state(self, path, resume):
+        if not os.path.exists(path):
+            if resume:
+                raise CommandError(f'Файл состояния {path} не найден')
+            return {'objects': 0, 'pending': {}}
+        if not resume:
+            raise CommandError(
+                f'Найден файл состояния прерванной загрузки {path}: '
+                'продолжите её с --resume или удалите файл.')
+        with open(path) as file:
+            return json.load(file)
+
+    def write_state(self, path, state):
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as file:
+            json.dump(state, file)
+        os.replace(temporary, path)
+
+    def reset_sequences(self, connection, models):
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+    def refresh_derived_data(self, models, using):
+        """Сигналы при загрузке не отправляются: счётчики, поисковый
+        индекс, кэш справочников и валидаторы списков обновляются здесь.
+        """
+        options = {'database': using, 'stdout': StringIO()}
+        if models & {Post, Comment}:
+            call_command('recount_comments', **options)
+        if Post in models and fts_available(using):
+            call_command('rebuild_search_index', **options)
+        if Category in models:
+            categories.invalidate()
+        if Location in models:
+            locations.invalidate()
+        invalidate_post_lists()
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.models import Post
+from blog.search import (
+    fts_available,
+    index_posts,
+    optimize_index,
+    remove_orphans,)
+
+
+class Command(BaseCommand):
+    help = ('Перестраивает индекс FTS5 публикаций порциями по id; '
+            'поиск остаётся доступен во время перестройки.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одной транзакции.')
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Псевдоним базы данных.')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not fts_available(using):
+            raise CommandError('Индекс FTS5 доступен только в SQLite')
+        chunk_size = options['chunk_size']
+        last_id = 0
+        indexed = 0
+        while True:
+            rows = list(
+                Post.objects.using(using).filter(
+                    id__gt=last_id).order_by('id').values_list(
+                    'id', 'title', 'text')[:chunk_size]
+            )
+            if not rows:
+                break
+            with transaction.atomic(using=using):
+                index_posts(rows, using)
+            indexed += len(rows)
+            last_id = rows[-1][0]
+        removed = remove_orphans(using)
+        optimize_index(using)
+        self.stdout.write(self.style.SUCCESS(
+            f'Проиндексировано публикаций: {indexed}, '
+            f'удалено устаревших записей: {removed}'))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comment_count порциями по id публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Количество публикаций в одной транзакции.')
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Псевдоним базы данных.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        using = options['database']
+        posts = Post.objects.using(using)
+        counts = Comment.objects.filter(
+            post=OuterRef('pk')
+        ).order_by().values('post').annotate(
+            total=Count('pk')
+        ).values('total')
+        last_id = 0
+        fixed = 0
+        while True:
+            ids = list(
+                posts.filter(id__gt=last_id).order_by('id').values_list(
+                    'id', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic(using=using):
+                fixed += posts.filter(id__in=ids).exclude(
+                    comment_count=Coalesce(Subquery(counts), 0)
+                ).update(comment_count=Coalesce(Subquery(counts), 0))
+            last_id = ids[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}'))
@@ -11,6 +11,7 @@ class BaseModel(models.Model):
         default=True,
         help_text='Снимите галочку, чтобы скрыть публикацию.')
     created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
 
     class Meta:
         abstract = True
@@ -74,12 +75,32 @@ class Post(BaseModel):
         blank=True,
         upload_to='images_fold',
     )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_published_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date', '-id'),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -102,6 +123,12 @@ class Comment(models.Model):
     class Meta:
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.author
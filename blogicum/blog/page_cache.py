@@ -0,0 +1,193 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from .utils import publication_now
+
+ENTRY_PREFIX = 'page-cache:entry:'
+TAG_PREFIX = 'page-cache:tag:'
+STATS_PREFIX = 'page-cache:stats:'
+
+
+def _increment(key):
+    if cache.add(key, 1, None):
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def post_cache_tags(posts):
+    """Теги, от которых зависит карточка или страница публикации."""
+    tags = set()
+    for post in posts:
+        tags.add(f'post:{post.id}')
+        tags.add(f'user:{post.author_id}')
+        if post.category_id:
+            tags.add(f'category:{post.category_id}')
+        if post.location_id:
+            tags.add(f'location:{post.location_id}')
+    return tags
+
+
+def get_tag_versions(tags):
+    keys = {TAG_PREFIX + tag: tag for tag in tags}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+        found[key] = version
+    return {tag: found[key] for key, tag in keys.items()}
+
+
+_deferred = threading.local()
+
+
+def _bump_tags(tags):
+    version = time.time_ns()
+    cache.set_many({TAG_PREFIX + tag: version for tag in tags}, None)
+
+
+def invalidate_tags(*tags):
+    """Сбрасывает все закэшированные страницы, помеченные тегами.
+
+    Новая версия тега — текущее время, а не ``incr()``: в файловом кэше
+    ``incr()`` не атомарен, и два процесса, сбросившие тег одновременно,
+    записали бы одну и ту же версию. Внутри транзакции теги сбрасываются
+    ещё раз после её фиксации: другой запрос мог прочитать прежние
+    строки и сохранить страницу уже под новой версией.
+    """
+    _bump_tags(tags)
+    repeated = getattr(_deferred, 'tags', None)
+    if repeated is not None:
+        repeated.update(tags)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_tags(tags))
+
+
+@contextmanager
+def repeat_invalidations():
+    """Повторно сбрасывает теги, сброшенные внутри блока, при выходе.
+
+    Оборачивает транзакцию: страница, закэшированная другим запросом
+    до фиксации транзакции, содержит старые данные и сбрасывается
+    повторно после неё.
+    """
+    outer = getattr(_deferred, 'tags', None)
+    _deferred.tags = set()
+    try:
+        yield
+    finally:
+        tags, _deferred.tags = _deferred.tags, outer
+        invalidate_tags(*tags)
+
+
+def get_page_cache_key(name, path, clock=True):
+    # Отложенные публикации не вызывают сигналов, поэтому ключ страниц,
+    # зависящих от часов публикации, меняется вместе с их интервалом.
+    digest = hashlib.md5(path.encode()).hexdigest()
+    if not clock:
+        return f'{ENTRY_PREFIX}{name}:{digest}'
+    clock = int(publication_now().timestamp())
+    return f'{ENTRY_PREFIX}{name}:{clock}:{digest}'
+
+
+def get_page_cache_timeout(name, clock=True):
+    """Время жизни записи страницы ``name``, секунды.
+
+    Запись страницы с часами публикации в ключе недоступна после смены
+    интервала, поэтому дольше ``PUBLICATION_CLOCK_BUCKET`` она не живёт.
+    """
+    timeout = settings.PAGE_CACHE_TTL.get(name)
+    if timeout and clock:
+        timeout = min(timeout, max(settings.PUBLICATION_CLOCK_BUCKET, 1))
+    return timeout
+
+
+def get_cached_page(key):
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    versions = entry['versions']
+    current = cache.get_many([TAG_PREFIX + tag for tag in versions])
+    for tag, version in versions.items():
+        if current.get(TAG_PREFIX + tag) != version:
+            return None
+    return HttpResponse(entry['content'], content_type=entry['content_type'])
+
+
+def store_page(key, response, tags, timeout):
+    cache.set(key, {
+        'versions': get_tag_versions(tags),
+        'content': response.content,
+        'content_type': response['Content-Type'],
+    }, timeout)
+
+
+def count_page_cache(name, outcome):
+    _increment(f'{STATS_PREFIX}{name}:{outcome}')
+
+
+def get_page_cache_stats():
+    """Счётчики попаданий и промахов по именам страниц."""
+    names = settings.PAGE_CACHE_TTL
+    keys = [
+        f'{STATS_PREFIX}{name}:{outcome}'
+        for name in names
+        for outcome in ('hits', 'misses')
+    ]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            outcome: values.get(f'{STATS_PREFIX}{name}:{outcome}', 0)
+            for outcome in ('hits', 'misses')
+        }
+        for name in names
+    }
+
+
+class PageCacheMixin:
+    """Кэширует страницу целиком для анонимных GET-запросов.
+
+    Запись хранит версии тегов, от которых зависит страница; изменение
+    любой связанной модели меняет версию тега (см. ``signals``).
+    Страницы, содержимое которых не меняется с ходом часов публикации,
+    задают ``page_cache_clock = False`` и живут полный срок из
+    ``PAGE_CACHE_TTL``.
+    """
+
+    page_cache_clock = True
+
+    def get_page_cache_tags(self, response):
+        raise NotImplementedError(
+            'Определите get_page_cache_tags() в классе представления')
+
+    def dispatch(self, request, *args, **kwargs):
+        name = request.resolver_match.url_name
+        timeout = get_page_cache_timeout(name, self.page_cache_clock)
+        if (request.method != 'GET' or not timeout
+                or request.user.is_authenticated):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_page_cache_key(
+            name, request.get_full_path(), self.page_cache_clock)
+        response = get_cached_page(key)
+        if response is not None:
+            count_page_cache(name, 'hits')
+            response['X-Page-Cache'] = 'HIT'
+            return response
+        count_page_cache(name, 'misses')
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'render'):
+            response.render()
+            store_page(
+                key, response, self.get_page_cache_tags(response), timeout)
+        response['X-Page-Cache'] = 'MISS'
+        return response
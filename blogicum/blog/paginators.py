@@ -0,0 +1,300 @@
+import hashlib
+import json
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,)
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .page_cache import get_tag_versions
+
+COUNT_CACHE_TAG = 'post-count'
+
+
+class CursorPage(Sequence):
+    """Страница курсорной пагинации."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not (self.has_next() and self.object_list):
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not (self.has_previous() and self.object_list):
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class CursorPaginator:
+    """Пагинатор по ключу сортировки (keyset) без COUNT и OFFSET.
+
+    Все поля ``ordering`` должны сортироваться в одном направлении,
+    последнее поле должно быть уникальным (обычно ``id``).
+    """
+
+    cursor_mode = True
+
+    def __init__(self, object_list, per_page, ordering=('-pub_date', '-id')):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.descending = self.ordering[0].startswith('-')
+        self.fields = tuple(field.lstrip('-') for field in self.ordering)
+
+    def encode_cursor(self, obj):
+        values = []
+        for name in self.fields:
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            values.append(
+                value.isoformat() if hasattr(value, 'isoformat') else value)
+        return urlsafe_base64_encode(json.dumps(values).encode())
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(urlsafe_base64_decode(cursor))
+            if len(values) != len(self.fields):
+                raise ValueError
+            opts = self.object_list.model._meta
+            return [
+                opts.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise InvalidPage('Некорректный курсор страницы.')
+
+    def _seek(self, values, forward):
+        lookup = 'lt' if self.descending == forward else 'gt'
+        condition = Q()
+        for index, name in enumerate(self.fields):
+            equal = {field: value for field, value in zip(
+                self.fields[:index], values[:index])}
+            condition |= Q(**equal, **{f'{name}__{lookup}': values[index]})
+        return condition
+
+    def _reversed_ordering(self):
+        return tuple(
+            field[1:] if field.startswith('-') else f'-{field}'
+            for field in self.ordering
+        )
+
+    def page(self, after=None, before=None):
+        queryset = self.object_list
+        if before:
+            queryset = queryset.filter(
+                self._seek(self.decode_cursor(before), forward=False)
+            ).order_by(*self._reversed_ordering())
+            rows = list(queryset[:self.per_page + 1])
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return CursorPage(rows, self, True, has_previous)
+        queryset = queryset.order_by(*self.ordering)
+        if after:
+            queryset = queryset.filter(
+                self._seek(self.decode_cursor(after), forward=True))
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        return CursorPage(rows[:self.per_page], self, has_next, bool(after))
+
+
+class WindowedPage(Page):
+    """Страница с ограниченным окном номеров для шаблона."""
+
+    @cached_property
+    def elided_page_range(self):
+        """Первые и последние номера и соседние с текущим, с многоточиями."""
+        return list(self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=self.paginator.on_each_side,
+            on_ends=self.paginator.on_ends,
+        ))
+
+
+class UncountedPage(WindowedPage):
+    """Страница без общего числа объектов."""
+
+    elided_page_range = None
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
+
+
+class CountStrategyPaginator(Paginator):
+    """Paginator с выбором способа подсчёта числа объектов.
+
+    ``exact`` — обычный COUNT на каждый запрос;
+    ``cached`` — COUNT кэшируется по тексту запроса до изменения публикаций;
+    ``estimated`` — оценка по статистике SQLite (sqlite_stat1), при её
+    отсутствии используется ``cached``. Статистика обновляется только
+    ANALYZE и может отставать, а индекс — включать скрытые строки, поэтому
+    оценка задаёт лишь окно номеров: страница выбирается как в ``none``,
+    существующий номер не отклоняется, и выборка уточняет число объектов;
+    ``none`` — без подсчёта, наличие следующей страницы определяется
+    выборкой ``per_page + 1`` строк.
+    """
+
+    cursor_mode = False
+    COUNT_STRATEGIES = ('exact', 'cached', 'estimated', 'none')
+    on_each_side = 2
+    on_ends = 1
+
+    def __init__(self, *args, count_strategy='exact', estimate_index=None,
+                 estimate_depth=0, **kwargs):
+        if count_strategy not in self.COUNT_STRATEGIES:
+            raise ValueError(
+                f'Неизвестный способ подсчёта: {count_strategy!r}')
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+        self.estimate_index = estimate_index
+        self.estimate_depth = estimate_depth
+
+    @property
+    def counted(self):
+        return self.count_strategy != 'none'
+
+    def _exact_count(self):
+        return super().count
+
+    def _cached_count(self):
+        query = str(self.object_list.query).encode()
+        version = get_tag_versions([COUNT_CACHE_TAG])[COUNT_CACHE_TAG]
+        key = (f'paginator-count:{version}:'
+               f'{hashlib.md5(query).hexdigest()}')
+        count = cache.get(key)
+        if count is None:
+            count = self._exact_count()
+            cache.set(key, count, settings.PAGINATOR_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def _estimated_count(self):
+        """Число строк индекса или среднее на значение первых столбцов."""
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'sqlite':
+            return None
+        table = self.object_list.model._meta.db_table
+        sql = 'SELECT stat FROM sqlite_stat1 WHERE tbl = %s'
+        params = [table]
+        if self.estimate_index:
+            sql += ' AND idx = %s'
+            params.append(self.estimate_index)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+        except DatabaseError:
+            return None
+        estimates = []
+        for (stat,) in rows:
+            try:
+                estimates.append(int(stat.split()[self.estimate_depth]))
+            except (IndexError, ValueError):
+                continue
+        return max(estimates, default=None)
+
+    @cached_property
+    def count(self):
+        if self.count_strategy == 'cached':
+            return self._cached_count()
+        if self.count_strategy == 'estimated':
+            estimate = self._estimated_count()
+            if estimate is None:
+                return self._cached_count()
+            return estimate
+        if self.count_strategy == 'none':
+            return None
+        return self._exact_count()
+
+    @cached_property
+    def num_pages(self):
+        if not self.counted:
+            return None
+        return super().num_pages
+
+    @property
+    def page_range(self):
+        if not self.counted:
+            return None
+        return super().page_range
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+    def validate_number(self, number):
+        if self.counted and self.count_strategy != 'estimated':
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не является целым числом')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1')
+        return number
+
+    def _fetch_page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На странице нет результатов')
+        return number, bottom, rows[:self.per_page], len(rows) > self.per_page
+
+    def _estimated_page(self, number):
+        number, bottom, rows, has_next = self._fetch_page(number)
+        # Выборка даёт точное число объектов на последней странице и
+        # нижнюю границу на остальных.
+        known = bottom + len(rows)
+        self.count = max(self.count, known + 1) if has_next else known
+        self.__dict__.pop('num_pages', None)
+        return self._get_page(rows, number, self)
+
+    def page(self, number):
+        if self.count_strategy == 'estimated':
+            return self._estimated_page(number)
+        if self.counted:
+            return super().page(number)
+        number, _, rows, has_next = self._fetch_page(number)
+        return UncountedPage(rows, number, self, has_next)
@@ -0,0 +1,156 @@
+"""Кэш справочников (категорий и местоположений) в памяти процесса."""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Category, Location
+from .page_cache import get_tag_versions, invalidate_tags
+
+
+class ReferenceCache:
+    """LRU-кэш строк небольшой таблицы в памяти процесса.
+
+    Хранятся значения полей, а не экземпляры: каждый вызов получает
+    собственный объект модели. Поколение кэша — версия тега в общем
+    кэше Django; изменение строки увеличивает её (см. ``signals``), и
+    остальные процессы сбрасывают свои копии не позже чем через
+    ``REFERENCE_CACHE_CHECK_INTERVAL`` секунд.
+    """
+
+    def __init__(self, model, index_fields=()):
+        self.model = model
+        self.index_fields = tuple(index_fields)
+        self.tag = f'reference:{model._meta.label_lower}'
+        self.field_names = [
+            field.attname for field in model._meta.concrete_fields]
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, generation):
+        self._rows = OrderedDict()
+        self._indexes = {name: {} for name in self.index_fields}
+        self._published_ids = None
+        self._generation = generation
+        self._checked_at = time.monotonic()
+
+    def _sync(self):
+        now = time.monotonic()
+        if (self._generation is not None and now - self._checked_at
+                < settings.REFERENCE_CACHE_CHECK_INTERVAL):
+            return
+        generation = get_tag_versions([self.tag])[self.tag]
+        with self._lock:
+            if generation != self._generation:
+                self._reset(generation)
+            self._checked_at = now
+
+    def _build(self, values):
+        return self.model.from_db(
+            self.model.objects.db, self.field_names, values)
+
+    def _store(self, objects):
+        with self._lock:
+            for obj in objects:
+                values = tuple(
+                    getattr(obj, name) for name in self.field_names)
+                self._rows[obj.pk] = values
+                self._rows.move_to_end(obj.pk)
+                for name in self.index_fields:
+                    self._indexes[name][getattr(obj, name)] = obj.pk
+            while len(self._rows) > settings.REFERENCE_CACHE_SIZE:
+                _, values = self._rows.popitem(last=False)
+                for name in self.index_fields:
+                    value = values[self.field_names.index(name)]
+                    self._indexes[name].pop(value, None)
+
+    def _lookup(self, pk):
+        with self._lock:
+            values = self._rows.get(pk)
+            if values is not None:
+                self._rows.move_to_end(pk)
+            return values
+
+    def get_many(self, ids):
+        """Словарь ``{pk: объект}``; промахи загружаются одним запросом."""
+        self._sync()
+        found = {}
+        missing = []
+        for pk in set(ids):
+            values = self._lookup(pk)
+            if values is None:
+                missing.append(pk)
+            else:
+                found[pk] = self._build(values)
+        if missing:
+            loaded = self.model.objects.in_bulk(missing)
+            self._store(loaded.values())
+            found.update(loaded)
+        return found
+
+    def get(self, pk):
+        return self.get_many([pk]).get(pk)
+
+    def get_by(self, field, value):
+        """Объект по значению уникального поля из ``index_fields``."""
+        self._sync()
+        with self._lock:
+            pk = self._indexes[field].get(value)
+        if pk is not None:
+            obj = self.get(pk)
+            if obj is not None and getattr(obj, field) == value:
+                return obj
+        obj = self.model.objects.filter(**{field: value}).first()
+        if obj is not None:
+            self._store([obj])
+        return obj
+
+    def published_ids(self):
+        """Множество id опубликованных строк (вся таблица, один запрос)."""
+        self._sync()
+        ids = self._published_ids
+        if ids is None:
+            ids = frozenset(self.model.objects.filter(
+                is_published=True).values_list('id', flat=True))
+            with self._lock:
+                self._published_ids = ids
+        return ids
+
+    def clear(self):
+        with self._lock:
+            self._reset(None)
+
+    def invalidate(self):
+        """Сбрасывает кэш во всех процессах сразу и после фиксации.
+
+        Сигналы моделей приходят до фиксации транзакции: процесс, который
+        успел прочитать прежнюю строку под новым поколением, сбросит её
+        по второму поколению.
+        """
+        self._bump()
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        invalidate_tags(self.tag)
+        self.clear()
+
+
+categories = ReferenceCache(Category, index_fields=('slug',))
+locations = ReferenceCache(Location)
+
+
+def attach_references(posts):
+    """Подставляет публикациям категории и местоположения из кэша."""
+    posts = list(posts)
+    category_map = categories.get_many(
+        post.category_id for post in posts if post.category_id)
+    location_map = locations.get_many(
+        post.location_id for post in posts if post.location_id)
+    for post in posts:
+        if post.category_id in category_map:
+            post.category = category_map[post.category_id]
+        if post.location_id in location_map:
+            post.location = location_map[post.location_id]
+    return posts
@@ -0,0 +1,129 @@
+"""Полнотекстовый поиск по публикациям (SQLite FTS5)."""
+import re
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Post
+
+FTS_TABLE = 'blog_post_fts'
+
+MAX_TERMS = 10
+
+# Маркеры подсветки: экранирование HTML их не затрагивает.
+MARK_START = '\x02'
+MARK_END = '\x03'
+
+SNIPPET_TOKENS = 24
+
+
+def fts_available(using='default'):
+    return connections[using].vendor == 'sqlite'
+
+
+def index_posts(rows, using='default'):
+    """Обновляет индекс для строк ``(id, title, text)``."""
+    if not fts_available(using):
+        return
+    rows = list(rows)
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+            'VALUES (%s, %s, %s)',
+            rows)
+
+
+def remove_posts(ids, using='default'):
+    if not fts_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+            [(pk,) for pk in ids])
+
+
+def remove_orphans(using='default'):
+    """Удаляет из индекса строки уже удалённых публикаций."""
+    if not fts_available(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {FTS_TABLE} WHERE rowid NOT IN '
+            f'(SELECT id FROM {Post._meta.db_table})')
+        return cursor.rowcount
+
+
+def optimize_index(using='default'):
+    if fts_available(using):
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_query(query):
+    """Запрос FTS5 из пользовательской строки: все слова, по префиксу.
+
+    Слова берутся в кавычки, поэтому синтаксис FTS5 (``OR``, ``NEAR``,
+    ``*``, двоеточия) в строке пользователя не интерпретируется.
+    """
+    terms = re.findall(r'\w+', query)[:MAX_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_posts(queryset, query):
+    """Публикации из ``queryset``, подходящие под запрос, по релевантности.
+
+    Вне SQLite используется поиск по вхождению подстроки.
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not fts_available(queryset.db):
+        terms = Q()
+        for term in re.findall(r'\w+', query)[:MAX_TERMS]:
+            terms &= Q(title__icontains=term) | Q(text__icontains=term)
+        return queryset.filter(terms).order_by('-pub_date')
+    table = Post._meta.db_table
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = {table}.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)',
+            'search_title': (
+                f"highlight({FTS_TABLE}, 0, '{MARK_START}', '{MARK_END}')"),
+            'search_snippet': (
+                f"snippet({FTS_TABLE}, 1, '{MARK_START}', '{MARK_END}', "
+                f"'…', {SNIPPET_TOKENS})"),
+        },
+    ).order_by('search_rank', '-pub_date')
+
+
+def matching_ids(query):
+    """Подзапрос id публикаций, подходящих под запрос."""
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (build_match_query(query),))
+
+
+def render_highlight(value):
+    return mark_safe(
+        escape(value).replace(MARK_START, '<mark>').replace(
+            MARK_END, '</mark>'))
+
+
+def highlight_results(posts):
+    """Добавляет публикациям безопасный HTML заголовка и фрагмента."""
+    for post in posts:
+        title = getattr(post, 'search_title', None)
+        snippet = getattr(post, 'search_snippet', None)
+        post.title_html = render_highlight(title or post.title)
+        post.snippet_html = (
+            render_highlight(snippet) if snippet is not None else None)
+    return posts
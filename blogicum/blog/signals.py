@@ -0,0 +1,193 @@
+import threading
+from collections import defaultdict
+
+from django.contrib.auth.signals import user_logged_out
+from django.db.models import Count, F
+from django.core.cache import cache
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.db.models.functions import Greatest
+from django.dispatch import receiver
+from django.utils import timezone
+
+from blogicum.auth import invalidate_cached_user
+
+from .conditional import (
+    LIST_COMMENTS_TAG,
+    LIST_USERS_TAG,
+    SCHEDULE_KEY,
+    post_list_tags,
+)
+from .models import Category, Comment, Location, Post, User
+from .page_cache import invalidate_tags
+from .paginators import COUNT_CACHE_TAG
+from .reference_cache import categories, locations
+from .search import index_posts, remove_posts
+from .tasks import enqueue_image_job
+
+
+@receiver(post_save, sender=Comment)
+def update_post_on_comment_save(sender, instance, created, **kwargs):
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+# Публикации и пользователи, которые удаляются в текущем потоке: их
+# комментарии удаляются каскадом, и счётчики для них уже обновлены
+# одним запросом в pre_delete.
+_deleting = threading.local()
+
+
+def _deleting_ids(model):
+    if not hasattr(_deleting, 'ids'):
+        _deleting.ids = defaultdict(set)
+    return _deleting.ids[model]
+
+
+def _cascaded(comment):
+    return (comment.post_id in _deleting_ids(Post)
+            or comment.author_id in _deleting_ids(User))
+
+
+def _decrement_comment_counts(comments):
+    """Уменьшает счётчики одним UPDATE на каждое число удалённых."""
+    by_count = defaultdict(list)
+    rows = comments.values('post_id').annotate(removed=Count('id'))
+    for row in rows.order_by():
+        by_count[row['removed']].append(row['post_id'])
+    for removed, post_ids in by_count.items():
+        Post.objects.filter(pk__in=post_ids).update(
+            comment_count=Greatest(F('comment_count') - removed, 0),
+            updated_at=timezone.now(),
+        )
+    if by_count:
+        invalidate_tags(LIST_COMMENTS_TAG, *(
+            f'post:{post_id}'
+            for post_ids in by_count.values() for post_id in post_ids))
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    _deleting_ids(Post).add(instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+def update_posts_on_author_delete(sender, instance, **kwargs):
+    _deleting_ids(User).add(instance.pk)
+    _decrement_comment_counts(
+        Comment.objects.filter(author=instance).exclude(
+            post__author=instance))
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=User)
+def forget_deleted_instance(sender, instance, **kwargs):
+    _deleting_ids(sender).discard(instance.pk)
+
+
+@receiver(post_delete, sender=Comment)
+def update_post_on_comment_delete(sender, instance, **kwargs):
+    if _cascaded(instance):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, 0),
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    if _cascaded(instance):
+        return
+    invalidate_tags(f'post:{instance.post_id}', LIST_COMMENTS_TAG)
+
+
+@receiver(post_init, sender=Post)
+def remember_post_lists(sender, instance, **kwargs):
+    # Списки, в которых публикация записана в базе: смена категории
+    # меняет и прежний список.
+    instance._saved_list_tags = post_list_tags(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    tags = [
+        'feed',
+        COUNT_CACHE_TAG,
+        f'post:{instance.id}',
+        f'user:{instance.author_id}',
+    ]
+    if instance.category_id:
+        tags.append(f'category:{instance.category_id}')
+    list_tags = post_list_tags(instance)
+    invalidate_tags(*tags, *(instance._saved_list_tags | list_tags))
+    instance._saved_list_tags = list_tags
+    cache.delete(SCHEDULE_KEY)
+
+
+@receiver(post_save, sender=Post)
+def enqueue_image_variants(sender, instance, **kwargs):
+    if instance.image:
+        enqueue_image_job(instance.image.name)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, using, **kwargs):
+    index_posts([(instance.id, instance.title, instance.text)], using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    remove_posts([instance.id], using)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_pages(sender, instance, **kwargs):
+    invalidate_tags(COUNT_CACHE_TAG, f'category:{instance.id}')
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_pages(sender, instance, **kwargs):
+    invalidate_tags(f'location:{instance.id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, **kwargs):
+    categories.invalidate()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_cache(sender, **kwargs):
+    locations.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_tags(f'user:{instance.id}', LIST_USERS_TAG)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, user, **kwargs):
+    if user is not None:
+        invalidate_cached_user(user.pk)
@@ -0,0 +1,204 @@
+"""Генерация синтетических данных для нагрузочных замеров.
+
+Строки собираются порциями в процессах пула и возвращаются готовыми
+для ``executemany`` кортежами; к базе процессы не обращаются, вставку
+выполняет родительский процесс. Каждая порция получает свой генератор случайных
+чисел из сида и номера порции, поэтому результат не зависит от числа
+процессов.
+"""
+import itertools
+import random
+from datetime import timedelta
+
+import django
+from django.apps import apps
+from faker import Faker
+
+from .dumps import prepare_rows
+
+SENTENCE_BANK_SIZE = 2000
+PARAGRAPH_BANK_SIZE = 500
+NO_LOCATION_SHARE = 0.3
+HIDDEN_REFERENCE_SHARE = 0.1
+
+_state = {}
+
+
+class Popularity:
+    """Выбор id с весами по закону Ципфа: вес id ранга r — 1 / r^skew.
+
+    Ранги раздаются перемешиванием, поэтому популярные строки не
+    сосредоточены в начале таблицы.
+    """
+
+    def __init__(self, ids, skew, rng):
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cum_weights = list(itertools.accumulate(
+            1 / rank ** skew for rank in range(1, len(self.ids) + 1)))
+
+    def choose(self, rng):
+        return rng.choices(self.ids, cum_weights=self.cum_weights)[0]
+
+
+def init_worker(context):
+    """Готовит процесс пула: Faker, банки текстов и веса популярности.
+
+    ``context`` содержит сид, локаль, текущее время, параметры
+    распределений и id строк, на которые ссылаются порции; для
+    комментариев ``past_posts`` — id и возраст в секундах вышедших
+    публикаций.
+    """
+    if not apps.ready:
+        # Процессы, запущенные через spawn, не наследуют настроенный
+        # Django.
+        django.setup()
+    faker = Faker(context['locale'])
+    faker.seed_instance(context['seed'])
+    rng = random.Random(f'{context["seed"]}:popularity')
+    _state.clear()
+    _state.update(
+        context,
+        faker=faker,
+        sentences=[faker.sentence() for _ in range(SENTENCE_BANK_SIZE)],
+        paragraphs=[
+            faker.paragraph(nb_sentences=5)
+            for _ in range(PARAGRAPH_BANK_SIZE)
+        ],
+    )
+    for name in ('user_ids', 'category_ids'):
+        if name in context:
+            _state[name] = Popularity(context[name], context['skew'], rng)
+    if 'past_posts' in context:
+        post_ids, _ = context['past_posts']
+        _state['posts'] = Popularity(
+            range(len(post_ids)), context['skew'], rng)
+
+
+def prepared_chunk(make_rows, model, start, count):
+    """Порция ``make_rows`` в виде кортежей для ``insert_rows()``."""
+    from django.db import connections
+
+    return prepare_rows(
+        model, make_rows(start, count), connections[_state['using']])
+
+
+def _chunk_random(kind, start):
+    seed = f'{_state["seed"]}:{kind}:{start}'
+    _state['faker'].seed_instance(seed)
+    return random.Random(seed)
+
+
+def _past(rng):
+    """Момент в прошлом; недавние даты встречаются чаще."""
+    return _state['now'] - timedelta(
+        days=_state['days'] * rng.random() ** 2)
+
+
+def make_users(start, count):
+    rng = _chunk_random('users', start)
+    faker = _state['faker']
+    rows = []
+    for pk in range(start, start + count):
+        username = f'{faker.user_name()}{pk}'
+        rows.append({
+            'id': pk,
+            'username': username,
+            'first_name': faker.first_name(),
+            'last_name': faker.last_name(),
+            'email': f'{username}@{faker.free_email_domain()}',
+            'password': _state['password'],
+            'date_joined': _past(rng),
+        })
+    return rows
+
+
+def _reference(rng, pk):
+    created_at = _past(rng)
+    return {
+        'id': pk,
+        'is_published': rng.random() >= HIDDEN_REFERENCE_SHARE,
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+def make_categories(start, count):
+    rng = _chunk_random('categories', start)
+    faker = _state['faker']
+    return [
+        {
+            **_reference(rng, pk),
+            'title': faker.word().capitalize(),
+            'description': rng.choice(_state['paragraphs']),
+            'slug': f'category-{pk}',
+        }
+        for pk in range(start, start + count)
+    ]
+
+
+def make_locations(start, count):
+    rng = _chunk_random('locations', start)
+    faker = _state['faker']
+    return [
+        {**_reference(rng, pk), 'name': faker.city()}
+        for pk in range(start, start + count)
+    ]
+
+
+def _pub_date(rng):
+    if rng.random() < _state['future_share']:
+        return _state['now'] + timedelta(days=30 * rng.random())
+    return _past(rng)
+
+
+def make_posts(start, count):
+    rng = _chunk_random('posts', start)
+    faker = _state['faker']
+    rows = []
+    for pk in range(start, start + count):
+        pub_date = _pub_date(rng)
+        created_at = min(pub_date, _state['now']) - timedelta(
+            hours=24 * rng.random())
+        location_ids = _state['location_ids']
+        rows.append({
+            'id': pk,
+            'title': faker.sentence(nb_words=rng.randint(3, 8))[:256],
+            'text': '\n\n'.join(
+                rng.sample(_state['paragraphs'], rng.randint(1, 6))),
+            'pub_date': pub_date,
+            'author_id': _state['user_ids'].choose(rng),
+            'category_id': _state['category_ids'].choose(rng),
+            'location_id': (
+                rng.choice(location_ids)
+                if location_ids and rng.random() >= NO_LOCATION_SHARE
+                else None),
+            'is_published': rng.random() >= _state['unpublished_share'],
+            'created_at': created_at,
+            'updated_at': created_at,
+        })
+    return rows
+
+
+def make_comments(start, count):
+    """Комментарии к уже вышедшим публикациям.
+
+    Публикация выбирается по популярности, поэтому число комментариев
+    на публикацию распределено по степенному закону; время комментария
+    смещено к дате публикации.
+    """
+    rng = _chunk_random('comments', start)
+    post_ids, ages = _state['past_posts']
+    rows = []
+    for pk in range(start, start + count):
+        index = _state['posts'].choose(rng)
+        rows.append({
+            'id': pk,
+            'text': ' '.join(
+                rng.sample(_state['sentences'], rng.randint(1, 3)))[:256],
+            'post_id': post_ids[index],
+            'author_id': _state['user_ids'].choose(rng),
+            'created_at': _state['now'] - timedelta(
+                seconds=ages[index] * (1 - rng.random() ** 3)),
+        })
+    return rows
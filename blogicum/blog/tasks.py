@@ -0,0 +1,28 @@
+from django.utils import timezone
+
+from jobs.queue import enqueue, task
+
+from .images import generate_variants, store_variants
+from .models import Post
+from .page_cache import invalidate_tags, post_cache_tags
+
+IMAGE_VARIANTS_TASK = 'blog.image_variants'
+
+
+@task(IMAGE_VARIANTS_TASK)
+def create_image_variants(name):
+    """Создаёт варианты изображения и сбрасывает кэш публикаций с ним."""
+    info = generate_variants(name)
+    if info is None:
+        return
+    store_variants(name, info)
+    posts = Post.objects.filter(image=name)
+    tags = post_cache_tags(posts.only(
+        'id', 'author_id', 'category_id', 'location_id'))
+    posts.update(updated_at=timezone.now())
+    invalidate_tags('feed', *tags)
+
+
+def enqueue_image_job(name):
+    return enqueue(
+        IMAGE_VARIANTS_TASK, {'name': name}, key=f'image-variants:{name}')
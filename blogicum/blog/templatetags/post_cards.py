@@ -0,0 +1,49 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def get_card_version(post):
+    """Отпечаток всех полей, которые выводит карточка публикации."""
+    category = post.category
+    location = post.location
+    parts = (
+        post.title, post.text, post.pub_date.isoformat(), post.is_published,
+        post.updated_at.isoformat(),
+        post.image.name, post.comment_count, post.author.username,
+        category and (
+            category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+    )
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+def get_card_cache_key(post):
+    return f'post-card:{post.id}:{get_card_version(post)}'
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Карточки страницы ленты: кэш читается одним get_many."""
+    posts = list(posts)
+    keys = [get_card_cache_key(post) for post in posts]
+    cards = cache.get_many(keys)
+    missing = {}
+    card_template = None
+    for key, post in zip(keys, posts):
+        if key in cards:
+            continue
+        if card_template is None:
+            card_template = get_template(CARD_TEMPLATE)
+        cards[key] = missing[key] = card_template.render({'post': post})
+    if missing:
+        cache.set_many(missing, settings.POST_CARD_CACHE_TIMEOUT)
+    return [mark_safe(cards[key]) for key in keys]
@@ -0,0 +1,15 @@
+from django import template
+
+from blog.images import get_responsive_image
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, kind, lazy=False):
+    """``<img>`` публикации с srcset из уменьшенных вариантов."""
+    return {
+        'post': post,
+        'image': get_responsive_image(post.image, kind),
+        'lazy': lazy,
+    }
@@ -1,21 +1,36 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
 app_name = 'blog'
 
+
+def page_view(view_class):
+    """Представление страницы чтения: асинхронное при ``ASYNC_VIEWS``."""
+    if settings.ASYNC_VIEWS:
+        from .async_views import as_async_view
+
+        return as_async_view(view_class)
+    return view_class.as_view()
+
+
 urlpatterns = [
     path(
         '',
-        views.HomePageListView.as_view(),
+        page_view(views.HomePageListView),
         name='index'),
+    path(
+        'search/',
+        views.PostSearchView.as_view(),
+        name='search'),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryListView.as_view(),
+        page_view(views.CategoryListView),
         name='category_posts'),
     path(
         'profile/<str:username>/',
-        views.ProfileListView.as_view(),
+        page_view(views.ProfileListView),
         name='profile'),
     path(
         'profile/',
@@ -23,8 +38,12 @@ urlpatterns = [
         name='edit_profile'),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
+        page_view(views.PostDetailView),
         name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentListView.as_view(),
+        name='post_comments'),
     path(
         'posts/create/',
         views.PostCreateView.as_view(),
@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def publication_now():
+    """Текущее время, округлённое вниз до PUBLICATION_CLOCK_BUCKET секунд.
+
+    Внутри одного интервала все запросы ленты получают одинаковый
+    параметр ``pub_date__lte``, поэтому их результаты можно кэшировать.
+    """
+    now = timezone.now()
+    bucket = settings.PUBLICATION_CLOCK_BUCKET
+    if bucket <= 1:
+        return now
+    return datetime.fromtimestamp(
+        int(now.timestamp()) // bucket * bucket, tz=timezone.utc)
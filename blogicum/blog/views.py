@@ -1,19 +1,33 @@
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
-from django.http import Http404
-from django.shortcuts import get_object_or_404, redirect
-from django.utils import timezone
+from django.core.paginator import InvalidPage
+from django.db import transaction
+from django.http import Http404, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
+from django.utils.http import urlencode
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
     ListView,
+    TemplateView,
     UpdateView,)
 
 from blog.models import Category, Comment, Post, User
+from .conditional import (
+    LIST_USERS_TAG,
+    ConditionalGetMixin,
+    get_list_validators,
+    get_tag_time,
+)
 from .forms import CommentForm, PostForm, UserForm
+from .page_cache import PageCacheMixin, post_cache_tags
+from .paginators import CountStrategyPaginator, CursorPaginator
+from .reference_cache import attach_references, categories, locations
+from .search import highlight_results, search_posts
+from .utils import publication_now
+from .writer import WriteQueueError, write_queue
 
 
 class PostMixin:
@@ -23,16 +37,26 @@ class PostMixin:
 
 
 class PostDispatchMixin:
+    """Пускает к публикации только автора.
+
+    Публикация загружается один раз за запрос и затем возвращается
+    из ``get_object()`` и используется формой.
+    """
+
     def dispatch(self, request, *args, **kwargs):
         self.post_obj = get_object_or_404(
             Post,
             id=kwargs['post_id'])
-        if self.post_obj.author != request.user:
+        if self.post_obj.author_id != request.user.pk:
             return redirect(
                 'blog:post_detail',
                 post_id=self.kwargs['post_id'])
+        attach_references([self.post_obj])
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.post_obj
+
 
 class CommentMixin:
     model = Comment
@@ -41,17 +65,24 @@ class CommentMixin:
 
 
 class CommentCreateUpdateMixin:
+    """Пускает к комментарию только автора; комментарий загружается
+    один раз за запрос.
+    """
+
     pk_url_kwarg = 'comment_id'
 
     def dispatch(self, request, *args, **kwargs):
-        instance = get_object_or_404(
+        self.comment_obj = get_object_or_404(
             Comment,
             id=kwargs['comment_id'],
             post=kwargs['post_id'])
-        if instance.author != request.user:
+        if self.comment_obj.author_id != request.user.pk:
             raise Http404
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        return self.comment_obj
+
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
@@ -59,46 +90,174 @@ class CommentCreateUpdateMixin:
         )
 
 
-def get_default_queryset(query_filter, query_annotate):
-    queryset = Post.objects.select_related(
-        'location',
-        'category',
-        'author'
-    )
+class QueuedWriteMixin:
+    """Сохраняет форму через очередь записи (``blog.writer``).
+
+    Если очередь перегружена, отвечает 503 с ``Retry-After``.
+    """
+
+    def form_valid(self, form):
+        try:
+            self.object = write_queue.run(form.save)
+        except WriteQueueError:
+            response = render(self.request, 'pages/503.html', status=503)
+            response['Retry-After'] = settings.WRITE_QUEUE_RETRY_AFTER
+            return response
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class CursorPaginationMixin:
+    """Курсорная пагинация ленты; ?page=N обрабатывается по-старому.
+
+    Для постраничного режима ``count_strategy`` выбирает способ подсчёта
+    публикаций (см. ``CountStrategyPaginator``).
+    """
+
+    cursor_ordering = ('-pub_date', '-id')
+    paginator_class = CountStrategyPaginator
+    count_strategy = 'exact'
+    count_estimate_index = None
+    count_estimate_depth = 0
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        return self.paginator_class(
+            queryset,
+            per_page,
+            orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_strategy=self.count_strategy,
+            estimate_index=self.count_estimate_index,
+            estimate_depth=self.count_estimate_depth,
+            **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+def get_default_queryset(query_filter, query_order):
+    """Публикации с автором; категории и местоположения подставляются
+    из кэша справочников (``attach_references``), без JOIN.
+    """
+    queryset = Post.objects.select_related('author')
     if query_filter:
         queryset = queryset.filter(
             is_published=True,
-            category__is_published=True,
-            pub_date__lte=timezone.now()
+            category__in=categories.published_ids(),
+            pub_date__lte=publication_now()
         )
-    if query_annotate:
-        queryset = queryset.annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date')
+    if query_order:
+        queryset = queryset.order_by('-pub_date')
     return queryset
 
 
-class HomePageListView(ListView):
+class CachedReferencesMixin:
+    """Подставляет публикациям страницы категории и местоположения."""
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size))
+        page.object_list = attach_references(object_list)
+        return paginator, page, page.object_list, is_paginated
+
+
+class PostListConditionalMixin(ConditionalGetMixin):
+    """Валидаторы списка публикаций по версиям его тегов.
+
+    Запросов к таблице публикаций нет, см. ``get_list_validators()``.
+    """
+
+    def get_list_tags(self):
+        raise NotImplementedError(
+            'Определите get_list_tags() в классе представления')
+
+    def get_last_modified(self):
+        last_modified, self.list_versions = get_list_validators(
+            self.get_list_tags())
+        return last_modified
+
+    def get_etag_parts(self):
+        return self.list_versions
+
+
+def is_post_visible(is_published, category, pub_date, author_id, user):
+    """Видна ли публикация пользователю: автору — всегда, остальным —
+    опубликованная, в опубликованной категории и уже вышедшая.
+    """
+    return author_id == user.pk or (
+        is_published
+        and category is not None and category.is_published
+        and pub_date <= publication_now())
+
+
+def check_post_visible(post, user):
+    if not is_post_visible(post.is_published, post.category, post.pub_date,
+                           post.author_id, user):
+        raise Http404
+
+
+def get_comments_page(post, after=None):
+    paginator = CursorPaginator(
+        post.comments.select_related('author'),
+        settings.COMMENTS_PAGE_SIZE,
+        ordering=('created_at', 'id'))
+    try:
+        return paginator.page(after=after)
+    except InvalidPage as error:
+        raise Http404(str(error))
+
+
+class HomePageListView(PostListConditionalMixin,
+                       PageCacheMixin,
+                       CachedReferencesMixin,
+                       CursorPaginationMixin,
+                       ListView):
     """VIEW-класс главной страницы"""
 
-    queryset = get_default_queryset(True, True)
     template_name = 'blog/index.html'
     paginate_by = settings.PAGE_SIZE
+    count_strategy = 'estimated'
+    count_estimate_index = 'post_published_feed_idx'
+
+    def get_queryset(self):
+        return get_default_queryset(True, True)
+
+    def get_list_tags(self):
+        return ('list:feed',)
+
+    def get_page_cache_tags(self, response):
+        return {'feed'} | post_cache_tags(response.context_data['page_obj'])
 
 
-class CategoryListView(ListView):
+class CategoryListView(PostListConditionalMixin,
+                       PageCacheMixin,
+                       CachedReferencesMixin,
+                       CursorPaginationMixin,
+                       ListView):
     """VIEW-класс страницы категорий"""
 
     model = Category
     template_name = 'blog/category.html'
     paginate_by = settings.PAGE_SIZE
+    count_strategy = 'cached'
+
+    def get_category(self):
+        category = categories.get_by('slug', self.kwargs['category_slug'])
+        if category is None or not category.is_published:
+            raise Http404
+        return category
 
     def get_queryset(self):
-        self.category = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        self.category = self.get_category()
         return get_default_queryset(
             True,
             True).filter(
@@ -110,20 +269,37 @@ class CategoryListView(ListView):
         context['category'] = self.category
         return context
 
+    def get_list_tags(self):
+        return (f'list:category:{self.get_category().id}',)
+
+    def get_page_cache_tags(self, response):
+        return {f'category:{self.category.id}'} | post_cache_tags(
+            response.context_data['page_obj'])
 
-class ProfileListView(ListView):
+
+class ProfileListView(PostListConditionalMixin,
+                      PageCacheMixin,
+                      CachedReferencesMixin,
+                      CursorPaginationMixin,
+                      ListView):
     """VIEW-класс страницы профиля"""
 
     model = Post
     template_name = 'blog/profile.html'
     slug_url_kwarg = 'username'
     paginate_by = settings.PAGE_SIZE
+    count_strategy = 'cached'
+
+    def get_profile_user(self):
+        if not hasattr(self, 'user'):
+            self.user = get_object_or_404(
+                User,
+                username=self.kwargs['username']
+            )
+        return self.user
 
     def get_queryset(self):
-        self.user = get_object_or_404(
-            User,
-            username=self.kwargs['username']
-        )
+        self.get_profile_user()
         if self.user == self.request.user:
             return get_default_queryset(
                 False,
@@ -141,6 +317,43 @@ class ProfileListView(ListView):
         context['profile'] = self.user
         return context
 
+    def get_list_tags(self):
+        return (f'list:user:{self.get_profile_user().id}',)
+
+    def get_etag_parts(self):
+        return super().get_etag_parts() + (
+            self.user.username,
+            self.user.get_full_name(),
+            self.user.is_staff,
+        )
+
+    def get_page_cache_tags(self, response):
+        return {f'user:{self.user.id}'} | post_cache_tags(
+            response.context_data['page_obj'])
+
+
+class PostSearchView(CachedReferencesMixin, ListView):
+    """VIEW-класс полнотекстового поиска по публикациям"""
+
+    template_name = 'blog/search.html'
+    paginate_by = settings.PAGE_SIZE
+    paginator_class = CountStrategyPaginator
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return self.paginator_class(
+            queryset, per_page, count_strategy='none', **kwargs)
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(get_default_queryset(True, False), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        highlight_results(context['page_obj'])
+        context['query'] = self.query
+        context['query_string'] = urlencode({'q': self.query})
+        return context
+
 
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     """VIEW-класс редактирования профиля пользователя"""
@@ -158,7 +371,10 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
             kwargs={'username': self.request.user})
 
 
-class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
+class PostCreateView(LoginRequiredMixin,
+                     PostMixin,
+                     QueuedWriteMixin,
+                     CreateView):
     """VIEW-класс создания поста"""
 
     def form_valid(self, form):
@@ -171,28 +387,84 @@ class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
             kwargs={'username': self.request.user})
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, PageCacheMixin, DetailView):
     """VIEW-класс подробной информации о посте"""
 
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
+    # Вышедшая публикация остаётся видимой, поэтому страница не зависит
+    # от интервала часов публикации.
+    page_cache_clock = False
 
     def get_queryset(self):
         return get_default_queryset(False, False)
 
     def get_object(self):
         post = super().get_object()
-        if not (self.request.user == post.author) and (
-                post.is_published is False
-                or post.category.is_published is False
-                or post.pub_date > timezone.now()):
-            raise Http404
+        attach_references([post])
+        check_post_visible(post, self.request.user)
         return post
 
+    def get_last_modified(self):
+        # Скрытая публикация не получает валидаторов: её ответ — 404, как
+        # для несуществующей, и 304 не выдаёт, что она есть.
+        row = Post.objects.filter(pk=self.kwargs['post_id']).values(
+            'updated_at',
+            'is_published',
+            'pub_date',
+            'author_id',
+            'category_id',
+            'location_id',
+            'author__username',
+        ).first()
+        if row is None:
+            return None
+        category = (
+            categories.get(row['category_id']) if row['category_id'] else None)
+        if not is_post_visible(row['is_published'], category, row['pub_date'],
+                               row['author_id'], self.request.user):
+            return None
+        self.author_username = row['author__username']
+        # Имена авторов комментариев меняются без изменения публикации.
+        users_changed_at, self.users_version = get_tag_time(LIST_USERS_TAG)
+        location = (
+            locations.get(row['location_id']) if row['location_id'] else None)
+        return max(
+            [row['updated_at'], users_changed_at]
+            + [obj.updated_at for obj in (category, location)
+               if obj is not None])
+
+    def get_etag_parts(self):
+        return (self.author_username, self.users_version)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = self.object.comments.select_related('author')
+        context['comments'] = get_comments_page(self.object)
+        return context
+
+    def get_page_cache_tags(self, response):
+        return post_cache_tags([self.object]) | {
+            f'user:{comment.author_id}'
+            for comment in response.context_data['comments']
+        }
+
+
+class CommentListView(TemplateView):
+    """VIEW-класс следующей порции комментариев к посту (HTML-фрагмент)"""
+
+    template_name = 'includes/comment_list.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        post = get_object_or_404(
+            get_default_queryset(False, False),
+            id=self.kwargs['post_id'])
+        attach_references([post])
+        check_post_visible(post, self.request.user)
+        context['post'] = post
+        context['comments'] = get_comments_page(
+            post, after=self.request.GET.get('after'))
         return context
 
 
@@ -234,7 +506,10 @@ class PostDeleteView(PostDispatchMixin,
             kwargs={'username': self.request.user})
 
 
-class CommentCreateView(LoginRequiredMixin, CommentMixin, CreateView):
+class CommentCreateView(LoginRequiredMixin,
+                        CommentMixin,
+                        QueuedWriteMixin,
+                        CreateView):
     """VIEW-класс создания комментария к посту"""
 
     pk_url_kwarg = 'post_id'
@@ -268,3 +543,7 @@ class CommentDeleteView(CommentCreateUpdateMixin,
                         CommentMixin,
                         DeleteView):
     """VIEW-класс удаления комментария"""
+
+    def delete(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(request, *args, **kwargs)
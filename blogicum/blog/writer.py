@@ -0,0 +1,123 @@
+"""Очередь записи: изменения из представлений выполняет один поток.
+
+SQLite допускает одного писателя, и при всплеске одновременных записей
+запросы ждут блокировку и падают с ``OperationalError``. С
+``WRITE_QUEUE_ENABLED`` записи из представлений передаются потоку-
+писателю процесса, который выполняет накопившиеся записи в одной
+короткой транзакции.
+"""
+import os
+import queue
+import threading
+from concurrent import futures
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .page_cache import repeat_invalidations
+
+
+class WriteQueueError(Exception):
+    """Запись не выполнена: очередь перегружена."""
+
+
+class WriteQueueFull(WriteQueueError):
+    pass
+
+
+class WriteTimeout(WriteQueueError):
+    pass
+
+
+class WriteQueue:
+    """Очередь записей с одним потоком-писателем на процесс.
+
+    Каждая запись выполняется в своей точке сохранения внутри общей
+    транзакции пачки, поэтому ошибка одной записи не отменяет
+    остальные. Очередь ограничена ``WRITE_QUEUE_MAX_PENDING``
+    записями, пачка — ``WRITE_QUEUE_BATCH_SIZE``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def _ensure_started(self):
+        with self._lock:
+            # После fork() поток родительского процесса не существует.
+            if (self._thread is not None and self._thread.is_alive()
+                    and self._pid == os.getpid()):
+                return
+            self._queue = queue.Queue(settings.WRITE_QUEUE_MAX_PENDING)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._serve, args=(self._queue,),
+                name='blog-writer', daemon=True)
+            self._thread.start()
+
+    def run(self, func, *args, **kwargs):
+        """Выполняет ``func`` в транзакции и возвращает результат.
+
+        ``WriteQueueFull`` — очередь заполнена, ``WriteTimeout`` —
+        запись не началась за ``WRITE_QUEUE_TIMEOUT`` секунд; в обоих
+        случаях запись не выполнена и не будет выполнена.
+        """
+        if not settings.WRITE_QUEUE_ENABLED:
+            with transaction.atomic():
+                return func(*args, **kwargs)
+        self._ensure_started()
+        future = futures.Future()
+        try:
+            self._queue.put_nowait((future, func, args, kwargs))
+        except queue.Full:
+            raise WriteQueueFull('Очередь записи переполнена.')
+        try:
+            return future.result(timeout=settings.WRITE_QUEUE_TIMEOUT)
+        except futures.TimeoutError:
+            if future.cancel():
+                raise WriteTimeout('Запись не выполнена вовремя.')
+        # Запись уже выполняется в текущей пачке.
+        return future.result()
+
+    def _serve(self, pending):
+        while True:
+            batch = [pending.get()]
+            while len(batch) < settings.WRITE_QUEUE_BATCH_SIZE:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [
+                item for item in batch
+                if item[0].set_running_or_notify_cancel()
+            ]
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        results = []
+        try:
+            with repeat_invalidations(), transaction.atomic():
+                for future, func, args, kwargs in batch:
+                    try:
+                        with transaction.atomic():
+                            result = func(*args, **kwargs)
+                    except Exception as error:
+                        results.append((future, None, error))
+                    else:
+                        results.append((future, result, None))
+        except Exception as error:
+            connection.close()
+            for future, *_ in batch:
+                future.set_exception(error)
+            return
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+write_queue = WriteQueue()
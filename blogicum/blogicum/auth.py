@@ -0,0 +1,43 @@
+"""Загрузка пользователя текущей сессии через кэш Django."""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+USER_PREFIX = 'blogicum.auth.user:'
+
+
+def get_user_cache_key(user_id):
+    return f'{USER_PREFIX}{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    """Сбрасывает запись сразу и ещё раз после фиксации транзакции.
+
+    Иначе параллельный запрос, прочитавший строку до фиксации, вернул бы
+    в кэш прежнего пользователя.
+    """
+    key = get_user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend``, который не обращается к базе на каждом запросе.
+
+    ``AuthenticationMiddleware`` загружает пользователя сессии через
+    ``get_user()``; запись в кэше сбрасывается при сохранении и удалении
+    пользователя (смена пароля, правка профиля, ``last_login``) и при
+    выходе из системы, см. ``blog.signals``. Кэш общий для всех процессов
+    сервера (``CACHES``), поэтому сброс виден каждому из них, а сверка
+    хэша пароля в сессии завершает другие сессии после смены пароля.
+    """
+
+    def get_user(self, user_id):
+        key = get_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
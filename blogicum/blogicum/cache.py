@@ -0,0 +1,32 @@
+"""Файловый кэш, общий для всех процессов сервера на одной машине.
+
+Подключается в ``CACHES`` как ``'blogicum.cache.FileBasedCache'``.
+"""
+import time
+
+from django.core.cache.backends import filebased
+
+
+class FileBasedCache(filebased.FileBasedCache):
+    """``FileBasedCache``, который не перечисляет каталог на каждой записи.
+
+    Стандартный бэкенд перед каждой записью считает файлы каталога, и при
+    десятках тысяч записей это занимает десятки миллисекунд. Здесь
+    проверка переполнения выполняется не чаще раза в
+    ``OPTIONS['CULL_INTERVAL']`` секунд в каждом процессе; между
+    проверками каталог может ненадолго превысить ``MAX_ENTRIES``.
+    """
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self._cull_interval = params.get(
+            'OPTIONS', {}).get('CULL_INTERVAL', 10)
+        self._culled_at = None
+
+    def _cull(self):
+        now = time.monotonic()
+        if (self._culled_at is not None
+                and now - self._culled_at < self._cull_interval):
+            return
+        self._culled_at = now
+        super()._cull()
@@ -0,0 +1,42 @@
+"""Сессии в кэше Django с записью в базу данных.
+
+Подключается настройкой ``SESSION_ENGINE = 'blogicum.sessions'``.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore,
+)
+
+TOUCH_PREFIX = 'blogicum.sessions.touched:'
+
+
+class SessionStore(CachedDBStore):
+    """Сессия читается из кэша, изменения сразу записываются в базу.
+
+    По умолчанию неизменённая сессия не сохраняется. Если включён
+    ``SESSION_SAVE_EVERY_REQUEST``, она сохраняется на каждом запросе
+    только для продления срока жизни; строку в базе такое продление
+    перезаписывает не чаще раза в ``SESSION_TOUCH_INTERVAL`` секунд, в
+    остальных случаях обновляется только запись в кэше.
+    """
+
+    @property
+    def touch_key(self):
+        return TOUCH_PREFIX + self.session_key
+
+    def save(self, must_create=False):
+        if (must_create or self.modified or self.session_key is None
+                or self._cache.get(self.touch_key) is None):
+            super().save(must_create)
+            self._cache.set(
+                self.touch_key, True, settings.SESSION_TOUCH_INTERVAL)
+        else:
+            self._cache.set(
+                self.cache_key, self._session, self.get_expiry_age())
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            session_key = self.session_key
+        super().delete(session_key)
+        if session_key is not None:
+            self._cache.delete(TOUCH_PREFIX + session_key)
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -36,6 +38,7 @@ ALLOWED_HOSTS = [
 INSTALLED_APPS = [
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'jobs.apps.JobsConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -52,15 +55,20 @@ STATICFILES_DIRS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.staticfiles.PrecompressedStaticMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+# Панель отладки работает только синхронно; без неё цепочка middleware
+# под ASGI остаётся асинхронной.
+if DEBUG:
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
@@ -69,11 +77,15 @@ ROOT_URLCONF = 'blogicum.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
@@ -81,6 +93,11 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
             ],
+            # В production шаблоны разбираются один раз на процесс,
+            # см. blogicum.warmup.preload_templates().
+            'loaders': TEMPLATE_LOADERS if DEBUG else [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ],
         },
     },
 ]
@@ -93,11 +110,60 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
     }
 }
 
+# PRAGMA для каждого соединения с SQLite (бэкенд blogicum.sqlite).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 128 * 1024 * 1024,
+    'temp_store': 'memory',
+}
+SQLITE_TRANSACTION_MODE = 'IMMEDIATE'
+
+# Очередь записи (blog.writer): создание публикаций и комментариев
+# выполняет один поток процесса. Ожидание результата ограничено
+# WRITE_QUEUE_TIMEOUT секундами, при перегрузке ответ — 503.
+WRITE_QUEUE_ENABLED = False
+WRITE_QUEUE_MAX_PENDING = 200
+WRITE_QUEUE_BATCH_SIZE = 50
+WRITE_QUEUE_TIMEOUT = 5
+WRITE_QUEUE_RETRY_AFTER = 1
+
+# Асинхронные ленты и страница публикации (blog.async_views) для запуска
+# через blogicum.asgi; запросы к базе данных и рендеринг шаблонов
+# выполняются в пуле из ASYNC_VIEW_THREADS потоков.
+ASYNC_VIEWS = False
+ASYNC_VIEW_THREADS = 8
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Кэш общий для всех процессов сервера: в нём версии тегов кэша страниц,
+# поколения кэша справочников, сессии и пользователи, и сброс должен
+# доходить до каждого процесса. Без брокера на одной машине это файловый
+# кэш; записей — страницы, карточки публикаций, счётчики, сведения об
+# изображениях, сессии и пользователи.
+CACHES = {
+    'default': {
+        'BACKEND': 'blogicum.cache.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'BLOGICUM_CACHE_DIR',
+            Path(tempfile.gettempdir()) / 'blogicum-cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+            'CULL_FREQUENCY': 4,
+            'CULL_INTERVAL': 10,
+        },
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -137,6 +203,15 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = 'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+
+# Cache-Control для файлов с хэшем в имени и для остальных, секунды.
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+
+STATIC_MAX_AGE = 60 * 60
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -150,8 +225,59 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN = 'login'
 
+AUTHENTICATION_BACKENDS = ['blogicum.auth.CachedModelBackend']
+
+AUTH_USER_CACHE_TIMEOUT = 60 * 5
+
+# Сессии читаются из кэша и записываются в базу данных. Если включить
+# SESSION_SAVE_EVERY_REQUEST, продление срока жизни перезаписывает строку
+# не чаще раза в SESSION_TOUCH_INTERVAL секунд.
+SESSION_ENGINE = 'blogicum.sessions'
+SESSION_TOUCH_INTERVAL = 60 * 5
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 PAGE_SIZE = 10
+
+PUBLICATION_CLOCK_BUCKET = 30
+
+# Время жизни закэшированных страниц для анонимных пользователей, секунды;
+# 0 отключает кэш страницы. Ключ лент (главная, категория, профиль)
+# содержит интервал часов публикации, поэтому их записи живут
+# min(TTL, PUBLICATION_CLOCK_BUCKET); страница публикации — полный TTL.
+PAGE_CACHE_TTL = {
+    'index': 60,
+    'category_posts': 120,
+    'profile': 120,
+    'post_detail': 300,
+}
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+PAGINATOR_COUNT_CACHE_TIMEOUT = 60 * 5
+
+# Кэш категорий и местоположений в памяти процесса: число строк каждой
+# таблицы и интервал проверки поколения в общем кэше, секунды.
+REFERENCE_CACHE_SIZE = 256
+REFERENCE_CACHE_CHECK_INTERVAL = 1
+
+COMMENTS_PAGE_SIZE = 50
+
+# Варианты Post.image: ширина 1x (создаётся также 2x) и атрибут sizes.
+POST_IMAGE_VARIANTS = {
+    'card': {'width': 600, 'sizes': '(min-width: 40rem) 38rem, 100vw'},
+    'detail': {'width': 800, 'sizes': '(min-width: 40rem) 38rem, 100vw'},
+}
+# Сколько секунд отрисовка не проверяет файлы вариантов, которых ещё нет.
+POST_IMAGE_PENDING_TIMEOUT = 60
+
+API_PAGE_SIZE = 20
+
+# Очередь фоновых задач (обработчик: manage.py run_jobs).
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 10
+JOBS_RETRY_BACKOFF_MAX = 60 * 60
+JOBS_LEASE = 60 * 5
+JOBS_KEEP_FINISHED = 60 * 60 * 24 * 7
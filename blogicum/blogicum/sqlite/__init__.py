@@ -0,0 +1,4 @@
+"""Бэкенд SQLite с настройкой каждого соединения.
+
+Подключается в ``DATABASES``: ``'ENGINE': 'blogicum.sqlite'``.
+"""
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+def get_pragma_statements(pragmas):
+    """``PRAGMA`` для словаря ``{имя: значение}``; ``busy_timeout`` первым.
+
+    Ожидание блокировки нужно уже при переключении ``journal_mode``.
+    """
+    names = sorted(pragmas, key=lambda name: name != 'busy_timeout')
+    return [f'PRAGMA {name} = {pragmas[name]}' for name in names]
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """SQLite, настроенный для одновременных запросов.
+
+    Каждое новое соединение выполняет ``SQLITE_PRAGMAS`` (WAL, размер
+    кэша, ``busy_timeout`` и т. п.). Транзакции ``atomic()`` начинаются
+    в режиме ``SQLITE_TRANSACTION_MODE``: с ``IMMEDIATE`` блокировка
+    записи берётся в начале транзакции и ожидается ``busy_timeout``,
+    а не приводит к «database is locked» при попытке записи из
+    транзакции, начатой на чтение.
+    """
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for statement in get_pragma_statements(settings.SQLITE_PRAGMAS):
+            conn.execute(statement).fetchall()
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        mode = settings.SQLITE_TRANSACTION_MODE.upper()
+        if mode not in TRANSACTION_MODES:
+            raise ValueError(
+                f'SQLITE_TRANSACTION_MODE: неизвестный режим {mode!r}.')
+        self.cursor().execute(f'BEGIN {mode}')
@@ -0,0 +1,170 @@
+"""Статика с хэшами в именах и заранее сжатыми копиями."""
+import asyncio
+import gzip
+import json
+import mimetypes
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.ico', '.txt', '.json', '.xml', '.html',
+)
+
+# Расширение копии и значение Content-Encoding в порядке предпочтения.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Сжатая копия сохраняется, только если она заметно меньше оригинала.
+MIN_COMPRESSION_RATIO = 0.95
+
+
+def compress_file(path):
+    """Пишет рядом с файлом .gz и, если доступен brotli, .br."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data)
+    written = []
+    for suffix, compressed in variants.items():
+        if len(compressed) >= len(data) * MIN_COMPRESSION_RATIO:
+            continue
+        with open(path + suffix, 'wb') as file:
+            file.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage, сжимающее файлы при collectstatic.
+
+    Пока collectstatic не запускался и манифеста нет (разработка, тесты),
+    файлы отдаются под исходными именами.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(paths):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            compress_file(self.path(name))
+            hashed_name = self.hashed_files.get(self.hash_key(name))
+            if hashed_name:
+                compress_file(self.path(hashed_name))
+
+
+def parse_accept_encoding(header):
+    """Множество кодировок из Accept-Encoding, кроме запрещённых q=0."""
+    accepted = set()
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0
+        if coding.strip() and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticMiddleware:
+    """Отдаёт файлы из STATIC_ROOT, выбирая сжатую копию по Accept-Encoding.
+
+    Индекс файлов строится один раз при загрузке middleware, поэтому
+    отдаются только собранные collectstatic файлы. Имена из манифеста
+    содержат хэш содержимого и кэшируются клиентами навсегда.
+    Поддерживает и синхронную, и асинхронную цепочку middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+        self.prefix = settings.STATIC_URL
+        self.files = {}
+        self.immutable = set()
+        if settings.STATIC_ROOT and Path(settings.STATIC_ROOT).is_dir():
+            self.build_index(Path(settings.STATIC_ROOT))
+
+    def build_index(self, root):
+        suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(suffixes):
+                    continue
+                path = os.path.join(directory, filename)
+                name = Path(path).relative_to(root).as_posix()
+                self.files[name] = (path, {
+                    coding: path + suffix
+                    for coding, suffix in ENCODINGS
+                    if os.path.isfile(path + suffix)
+                })
+        manifest = root / ManifestStaticFilesStorage.manifest_name
+        if manifest.is_file():
+            paths = json.loads(manifest.read_text()).get('paths', {})
+            self.immutable.update(paths.values())
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        return self.find(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.find(request) or await self.get_response(request)
+
+    def find(self, request):
+        if (request.method in ('GET', 'HEAD')
+                and request.path.startswith(self.prefix)):
+            name = request.path[len(self.prefix):]
+            if name in self.files:
+                return self.serve(request, name, *self.files[name])
+        return None
+
+    def serve(self, request, name, path, compressed):
+        content_type, _ = mimetypes.guess_type(name)
+        accepted = parse_accept_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        encoding = next(
+            (coding for coding, _ in ENCODINGS
+             if coding in compressed and coding in accepted),
+            None,
+        )
+        response = FileResponse(
+            open(compressed[encoding] if encoding else path, 'rb'),
+            content_type=content_type or 'application/octet-stream',
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if compressed:
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if name in self.immutable:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, '
+                'immutable')
+        else:
+            response['Cache-Control'] = (
+                f'public, max-age={settings.STATIC_MAX_AGE}')
+        return response
@@ -2,14 +2,22 @@ from django.contrib import admin
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.views import PasswordResetView
 from django.urls import path, include, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from jobs.forms import QueuedPasswordResetForm
+
 
 urlpatterns = [
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/', include('blog.api_urls', namespace='api')),
     path('admin/', admin.site.urls),
+    path('auth/password_reset/', PasswordResetView.as_view(
+        form_class=QueuedPasswordResetForm,
+    ),
+        name='password_reset',),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', CreateView.as_view(
         template_name='registration/registration_form.html',
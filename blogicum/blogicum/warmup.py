@@ -0,0 +1,48 @@
+"""Подготовка процесса к первому запросу."""
+from pathlib import Path
+
+from django.conf import settings
+from django.template import engines
+from django.urls import get_resolver
+from django.utils import timezone, translation
+
+
+def preload_templates():
+    """Загружает и компилирует все шаблоны из TEMPLATES['DIRS'].
+
+    С кэширующим загрузчиком скомпилированные шаблоны остаются в памяти,
+    и первый запрос к странице не тратит время на разбор файлов.
+    Возвращает число загруженных шаблонов.
+    """
+    loaded = 0
+    for backend in engines.all():
+        for directory in backend.engine.dirs:
+            directory = Path(directory)
+            for path in sorted(directory.rglob('*.html')):
+                backend.get_template(path.relative_to(directory).as_posix())
+                loaded += 1
+    return loaded
+
+
+def populate_url_resolver():
+    """Импортирует URLConf и строит таблицы обратного разрешения URL.
+
+    Иначе это происходит при первом ``{% url %}`` в первом запросе.
+    """
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict:
+        resolver.namespace_dict[namespace][1].reverse_dict
+
+
+def load_locale():
+    """Загружает каталоги переводов и данные часового пояса по умолчанию."""
+    timezone.get_default_timezone()
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('')
+
+
+def warm_up():
+    populate_url_resolver()
+    load_locale()
+    return preload_templates()
@@ -0,0 +1,26 @@
+from django.contrib.auth.forms import PasswordResetForm
+
+from .queue import enqueue
+from .tasks import PASSWORD_RESET_TASK
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Форма сброса пароля, отправляющая письмо фоновой задачей.
+
+    В задачу попадают только id пользователя и имена шаблонов; ссылку с
+    токеном строит сама задача (см. ``tasks.send_password_reset``).
+    """
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        enqueue(PASSWORD_RESET_TASK, {
+            'user_id': context['user'].pk,
+            'domain': context['domain'],
+            'site_name': context['site_name'],
+            'protocol': context['protocol'],
+            'subject_template_name': subject_template_name,
+            'email_template_name': email_template_name,
+            'from_email': from_email,
+            'html_email_template_name': html_email_template_name,
+        })
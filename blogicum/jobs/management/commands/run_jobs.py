@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import purge_finished, run_pending
+
+
+class Command(BaseCommand):
+    help = 'Обработчик очереди фоновых задач.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и завершиться.')
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Пауза между опросами пустой очереди, секунды.')
+
+    def handle(self, *args, **options):
+        purge_finished()
+        if options['once']:
+            processed = run_pending()
+            self.stdout.write(
+                self.style.SUCCESS(f'Выполнено задач: {processed}'))
+            return
+        try:
+            while True:
+                if not run_pending():
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Обработчик остановлен')
@@ -0,0 +1,49 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=100)
+    payload = models.JSONField('Аргументы', default=dict)
+    idempotency_key = models.CharField(
+        'Ключ идемпотентности',
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text='Повторная постановка с тем же ключом не создаёт задачу.')
+    status = models.CharField(
+        'Состояние', max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    run_at = models.DateTimeField('Запустить после', default=timezone.now)
+    locked_until = models.DateTimeField(
+        'Занята обработчиком до', null=True, blank=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='job_ready_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
@@ -0,0 +1,145 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name):
+    """Регистрирует функцию как фоновую задачу с именем ``name``."""
+    def decorator(func):
+        if name in _registry:
+            raise ValueError(f'Задача {name!r} уже зарегистрирована')
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'Неизвестная задача: {name!r}')
+
+
+def enqueue(name, payload=None, *, key=None, delay=0, max_attempts=None):
+    """Ставит задачу в очередь и сразу возвращает её запись.
+
+    Запись создаётся в текущей транзакции, поэтому задача не появится,
+    если транзакция будет отменена. Если задача с ключом ``key`` уже есть,
+    возвращается она.
+    """
+    get_task(name)
+    if key is not None:
+        existing = Job.objects.filter(idempotency_key=key).first()
+        if existing is not None:
+            return existing
+    job = Job(
+        name=name,
+        payload=payload or {},
+        idempotency_key=key,
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=key)
+    return job
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед повтором, в секундах."""
+    return min(
+        settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_BACKOFF_MAX,
+    )
+
+
+def _ready(now):
+    return (
+        Q(status=Job.PENDING, run_at__lte=now)
+        | Q(status=Job.RUNNING, locked_until__lt=now)
+    )
+
+
+def claim_next():
+    """Забирает ближайшую готовую задачу условным UPDATE.
+
+    Задача упавшего обработчика снова становится доступной по истечении
+    ``JOBS_LEASE`` секунд.
+    """
+    now = timezone.now()
+    candidates = Job.objects.filter(_ready(now)).order_by(
+        'run_at', 'id').values_list('id', flat=True)[:10]
+    for pk in candidates:
+        claimed = Job.objects.filter(_ready(now), pk=pk).update(
+            status=Job.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=settings.JOBS_LEASE),
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Выполняет задачу и сохраняет результат; возвращает True при успехе."""
+    try:
+        get_task(job.name)(**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+            job.finished_at = now
+            logger.exception('Задача %s окончательно завершилась ошибкой', job)
+        else:
+            job.status = Job.PENDING
+            job.run_at = now + timedelta(
+                seconds=get_retry_delay(job.attempts))
+            logger.warning('Задача %s будет повторена в %s', job, job.run_at)
+        job.locked_until = None
+        job.save(update_fields=(
+            'status', 'run_at', 'locked_until', 'last_error', 'finished_at'))
+        return False
+    job.status = Job.DONE
+    job.finished_at = timezone.now()
+    job.locked_until = None
+    job.save(update_fields=('status', 'locked_until', 'finished_at'))
+    return True
+
+
+def purge_finished():
+    """Удаляет выполненные задачи старше JOBS_KEEP_FINISHED секунд."""
+    deleted, _ = Job.objects.filter(
+        status=Job.DONE,
+        finished_at__lt=timezone.now() - timedelta(
+            seconds=settings.JOBS_KEEP_FINISHED),
+    ).delete()
+    return deleted
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи, пока они есть; возвращает их число."""
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next()
+        if job is None:
+            break
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from .queue import task
+
+SEND_MAIL_TASK = 'mail.send'
+PASSWORD_RESET_TASK = 'mail.password_reset'
+
+
+@task(SEND_MAIL_TASK)
+def send_mail(subject, body, from_email, to, html_body=None):
+    """Отправляет письмо через настроенный EMAIL_BACKEND."""
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html_body is not None:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
+
+
+@task(PASSWORD_RESET_TASK)
+def send_password_reset(user_id, domain, site_name, protocol,
+                        subject_template_name, email_template_name,
+                        from_email, html_email_template_name=None):
+    """Отправляет письмо со ссылкой для сброса пароля.
+
+    Токен и текст письма создаются здесь, а не при постановке в очередь:
+    ссылка, по которой можно войти в чужую учётную запись, не должна
+    храниться в таблице задач.
+    """
+    user = get_user_model()._default_manager.filter(pk=user_id).first()
+    if user is None:
+        return
+    email = getattr(user, user.get_email_field_name())
+    context = {
+        'email': email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': protocol,
+    }
+    subject = loader.render_to_string(subject_template_name, context)
+    html_body = None
+    if html_email_template_name is not None:
+        html_body = loader.render_to_string(
+            html_email_template_name, context)
+    send_mail(
+        ''.join(subject.splitlines()),
+        loader.render_to_string(email_template_name, context),
+        from_email,
+        [email],
+        html_body,
+    )
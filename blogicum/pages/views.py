@@ -1,12 +1,28 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from blog.conditional import ConditionalGetMixin, get_template_mtime
 
-class AboutView(TemplateView):
+
+class StaticPageMixin(ConditionalGetMixin):
+    layout_templates = (
+        'base.html',
+        'includes/header.html',
+        'includes/footer.html',
+    )
+
+    def get_last_modified(self):
+        return max(
+            get_template_mtime(name)
+            for name in (self.template_name, *self.layout_templates)
+        )
+
+
+class AboutView(StaticPageMixin, TemplateView):
     template_name = 'pages/about.html'
 
 
-class RulesView(TemplateView):
+class RulesView(StaticPageMixin, TemplateView):
     template_name = 'pages/rules.html'
 
 
@@ -41,6 +41,37 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True, scope="session")
+def isolated_cache(tmp_path_factory):
+    # Тесты очищают кэш, поэтому у них свой каталог, а не каталог
+    # сервера; подпроцессы тестов получают его через окружение.
+    from django.conf import settings
+
+    location = str(tmp_path_factory.mktemp("cache"))
+    os.environ["BLOGICUM_CACHE_DIR"] = location
+    caches = {
+        **settings.CACHES,
+        "default": {**settings.CACHES["default"], "LOCATION": location},
+    }
+    with override_settings(CACHES=caches):
+        yield location
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(isolated_cache):
+    from django.core.cache import cache
+
+    from blog.reference_cache import categories, locations
+
+    cache.clear()
+    categories.clear()
+    locations.clear()
+    yield
+    cache.clear()
+    categories.clear()
+    locations.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
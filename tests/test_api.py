@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.conf import settings
+from django.db.models.signals import post_init
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(mixer, user, published_category, published_location):
+    now = datetime.now(tz=pytz.UTC)
+    return mixer.cycle(settings.API_PAGE_SIZE + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(1, 100)),
+    )
+
+
+def test_feed_pages_with_cursor(client, api_posts, future_posts):
+    data = client.get("/api/posts/").json()
+    assert len(data["results"]) == settings.API_PAGE_SIZE
+    assert data["previous"] is None
+    rest = client.get(data["next"]).json()
+    ids = [row["id"] for row in data["results"] + rest["results"]]
+    assert ids == [post.id for post in api_posts]
+    assert rest["next"] is None
+    back = client.get(rest["previous"]).json()
+    assert back["results"] == data["results"]
+
+
+def test_post_row_shape(client, api_posts):
+    post = api_posts[0]
+    data = client.get(f"/api/posts/{post.id}/").json()
+    assert data["title"] == post.title
+    assert data["author"] == post.author.username
+    assert data["category"]["slug"] == post.category.slug
+    assert data["location"] == post.location.name
+    assert data["comment_count"] == 0
+
+
+def test_visibility_rules(
+    client,
+    posts_with_unpublished_category,
+    future_posts,
+    unpublished_posts_with_published_locations,
+):
+    hidden = (posts_with_unpublished_category + future_posts
+              + unpublished_posts_with_published_locations)
+    assert client.get("/api/posts/").json()["results"] == []
+    for post in hidden:
+        assert client.get(f"/api/posts/{post.id}/").status_code == 404
+    author = hidden[0].author.username
+    assert client.get(f"/api/profiles/{author}/").json()["results"] == []
+
+
+def test_category_and_profile_endpoints(client, api_posts):
+    category = api_posts[0].category
+    data = client.get(f"/api/categories/{category.slug}/posts/").json()
+    assert data["category"]["slug"] == category.slug
+    assert len(data["results"]) == settings.API_PAGE_SIZE
+    assert category.slug in [
+        row["slug"] for row in client.get("/api/categories/").json()["results"]
+    ]
+    profile = client.get(f"/api/profiles/{api_posts[0].author.username}/")
+    assert profile.json()["profile"]["username"] == api_posts[0].author.username
+
+
+def test_strong_etag_and_304(client, api_posts):
+    response = client.get("/api/posts/")
+    etag = response["ETag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    cached = client.get("/api/posts/", HTTP_IF_NONE_MATCH=etag)
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    api_posts[0].title = "Изменённый заголовок"
+    api_posts[0].save()
+    assert client.get(
+        "/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_no_model_instances(client, api_posts):
+    created = []
+
+    def count(sender, **kwargs):
+        created.append(sender)
+
+    post_init.connect(count)
+    try:
+        client.get("/api/posts/")
+        client.get(f"/api/posts/{api_posts[0].id}/")
+        client.get(f"/api/categories/{api_posts[0].category.slug}/posts/")
+    finally:
+        post_init.disconnect(count)
+    assert created == []
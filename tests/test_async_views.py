@@ -0,0 +1,71 @@
+import asyncio
+import importlib
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import clear_url_caches, resolve
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+def _reload_urls():
+    import blog.urls
+    import blogicum.urls
+
+    importlib.reload(blog.urls)
+    importlib.reload(blogicum.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_urls(settings):
+    settings.ASYNC_VIEWS = True
+    settings.PAGE_CACHE_TTL = {}
+    _reload_urls()
+    yield
+    settings.ASYNC_VIEWS = False
+    _reload_urls()
+
+
+def _urls(post):
+    return (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    )
+
+
+def test_read_views_are_async(async_urls, post_with_published_location):
+    for url in _urls(post_with_published_location):
+        assert asyncio.iscoroutinefunction(resolve(url).func), url
+    assert not asyncio.iscoroutinefunction(resolve("/posts/create/").func)
+
+
+def test_pages_match_sync_views(async_urls, post_with_published_location):
+    post = post_with_published_location
+    async_client = AsyncClient()
+    for url in _urls(post):
+        response = async_to_sync(async_client.get)(url)
+        assert response.status_code == 200, url
+        assert post.title in response.content.decode(), url
+    response = async_to_sync(async_client.get)(f"/posts/{post.id + 1}/")
+    assert response.status_code == 404
+
+
+def test_concurrent_requests_use_bounded_pool(
+    async_urls, settings, post_with_published_location
+):
+    from blog.async_views import get_executor
+
+    async_client = AsyncClient()
+    url = f"/posts/{post_with_published_location.id}/"
+
+    async def burst():
+        return await asyncio.gather(
+            *(async_client.get(url) for _ in range(10)))
+
+    responses = async_to_sync(burst)()
+    assert [response.status_code for response in responses] == [200] * 10
+    assert get_executor()._max_workers == settings.ASYNC_VIEW_THREADS
@@ -0,0 +1,94 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _count(post):
+    post.refresh_from_db(fields=["comment_count"])
+    return post.comment_count
+
+
+def test_counter_follows_comment_writes(
+    mixer, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    own = mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    assert _count(post) == 3
+
+    own[0].delete()
+    assert _count(post) == 2
+
+    another_user.delete()
+    assert _count(post) == 1, (
+        "Убедитесь, что счётчик комментариев уменьшается и при каскадном"
+        " удалении."
+    )
+
+
+def test_cascades_do_not_update_per_comment(
+    mixer, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    other_post = mixer.blend("blog.Post", author=user)
+    mixer.cycle(20).blend("blog.Comment", post=post, author=another_user)
+    mixer.cycle(5).blend("blog.Comment", post=other_post, author=user)
+    mixer.cycle(3).blend(
+        "blog.Comment", post=other_post, author=another_user)
+    assert _count(other_post) == 8
+
+    with CaptureQueriesContext(connection) as captured:
+        another_user.delete()
+    updates = [
+        query["sql"] for query in captured.captured_queries
+        if query["sql"].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) <= 2, (
+        "Убедитесь, что при каскадном удалении счётчики обновляются одним"
+        " запросом на публикацию, а не на каждый комментарий."
+    )
+    assert len(captured.captured_queries) < 20
+    assert _count(other_post) == 5
+
+    with CaptureQueriesContext(connection) as captured:
+        other_post.delete()
+    assert not any(
+        query["sql"].startswith('UPDATE "blog_post"')
+        for query in captured.captured_queries
+    ), "Счётчик удаляемой публикации обновлять не нужно."
+
+
+def test_comment_views_update_counter(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", {"text": "Текст"})
+    assert _count(post) == 1
+    comment = post.comments.get()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    assert _count(post) == 0
+
+
+def test_recount_command_repairs_counter(
+    mixer, user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    type(post).objects.filter(pk=post.pk).update(comment_count=42)
+    call_command("recount_comments", chunk_size=1, stdout=StringIO())
+    assert _count(post) == 3
+
+
+def test_feed_does_not_touch_comments(
+    user_client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as captured:
+        user_client.get("/")
+    assert not any(
+        "blog_comment" in query["sql"] for query in captured.captured_queries
+    ), "Лента не должна обращаться к таблице комментариев."
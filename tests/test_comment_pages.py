@@ -0,0 +1,56 @@
+import re
+
+import pytest
+from django.conf import settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def many_comments(user, post_with_published_location):
+    from blog.models import Comment
+
+    Comment.objects.bulk_create(
+        Comment(post=post_with_published_location, author=user,
+                text=f"Комментарий {i}")
+        for i in range(settings.COMMENTS_PAGE_SIZE * 2 + 5)
+    )
+    return list(post_with_published_location.comments.order_by(
+        "created_at", "id"))
+
+
+def _more_link(content):
+    match = re.search(r'href="([^"]+/comments/\?after=[^"]+)"', content)
+    return match and match.group(1)
+
+
+def test_comments_are_loaded_in_batches(
+    user_client, post_with_published_location, many_comments
+):
+    post = post_with_published_location
+    content = user_client.get(f"/posts/{post.id}/").content.decode()
+    assert content.count('name="comment_') == settings.COMMENTS_PAGE_SIZE, (
+        "Убедитесь, что на странице публикации выводится только первая"
+        " порция комментариев."
+    )
+
+    seen = re.findall(r'name="comment_(\d+)"', content)
+    link = _more_link(content)
+    while link:
+        response = user_client.get(link)
+        assert response.status_code == 200
+        fragment = response.content.decode()
+        assert "<html" not in fragment
+        seen += re.findall(r'name="comment_(\d+)"', fragment)
+        link = _more_link(fragment)
+    assert [int(i) for i in seen] == [c.id for c in many_comments]
+
+
+def test_comment_fragment_respects_visibility(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
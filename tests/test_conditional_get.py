@@ -0,0 +1,233 @@
+import pytest
+from django.test.signals import template_rendered
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def rendered():
+    names = []
+
+    def collect(sender, template, **kwargs):
+        names.append(template.name)
+
+    template_rendered.connect(collect)
+    yield names
+    template_rendered.disconnect(collect)
+
+
+def _revalidate(client, url, response):
+    return client.get(
+        url,
+        HTTP_IF_NONE_MATCH=response["ETag"],
+        HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+    )
+
+
+def test_post_detail_not_modified(
+    unlogged_client, post_with_published_location, rendered
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = unlogged_client.get(url)
+    assert response.status_code == 200
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified")
+
+    rendered.clear()
+    repeated = _revalidate(unlogged_client, url, response)
+    assert repeated.status_code == 304, (
+        "Убедитесь, что повторный запрос неизменённой публикации с"
+        " If-None-Match получает ответ 304."
+    )
+    assert not repeated.content
+    assert not rendered, "Ответ 304 не должен рендерить шаблоны."
+
+
+def test_comment_changes_post_etag(
+    mixer, user, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = unlogged_client.get(url)
+    mixer.blend("blog.Comment", post=post, author=user)
+    repeated = _revalidate(unlogged_client, url, response)
+    assert repeated.status_code == 200
+    assert repeated["ETag"] != response["ETag"]
+
+
+@pytest.mark.parametrize("url", ("/", "/pages/about/", "/pages/rules/"))
+def test_list_and_static_pages_not_modified(
+    url, unlogged_client, post_with_published_location
+):
+    response = unlogged_client.get(url)
+    assert response.status_code == 200
+    assert _revalidate(unlogged_client, url, response).status_code == 304
+
+
+def test_new_post_changes_feed_etag(
+    mixer, user, unlogged_client, post_with_published_location
+):
+    response = unlogged_client.get("/")
+    post = post_with_published_location
+    mixer.blend(
+        "blog.Post", author=user, category=post.category,
+        location=post.location, pub_date=post.pub_date,
+        is_published=True)
+    assert _revalidate(unlogged_client, "/", response).status_code == 200
+
+
+def test_etag_depends_on_user(
+    user_client, unlogged_client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    anonymous = unlogged_client.get(url)
+    logged_in = user_client.get(url)
+    assert anonymous["ETag"] != logged_in["ETag"]
+    assert _revalidate(user_client, url, anonymous).status_code == 200
+
+
+def _csrf_token(client):
+    return client.cookies["csrftoken"].value
+
+
+def _login(client, user):
+    client.get("/auth/login/")
+    response = client.post("/auth/login/", {
+        "username": user.username,
+        "password": "password-123",
+        "csrfmiddlewaretoken": _csrf_token(client),
+    })
+    assert response.status_code == 302
+
+
+def test_relogin_changes_post_etag(user, post_with_published_location):
+    from django.test import Client
+
+    user.set_password("password-123")
+    user.save()
+    client = Client(enforce_csrf_checks=True)
+    url = f"/posts/{post_with_published_location.id}/"
+    _login(client, user)
+    response = client.get(url)
+    client.post("/auth/logout/", {
+        "csrfmiddlewaretoken": _csrf_token(client)})
+    _login(client, user)
+
+    repeated = _revalidate(client, url, response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что после повторного входа страница с формой"
+        " перерисовывается с новым токеном CSRF."
+    )
+    token = repeated.context["csrf_token"]
+    response = client.post(f"{url}comment/", {
+        "text": "Комментарий", "csrfmiddlewaretoken": str(token)})
+    assert response.status_code == 302
+
+
+def test_comment_author_rename_changes_post_etag(
+    mixer, another_user, unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend("blog.Comment", post=post, author=another_user)
+    url = f"/posts/{post.id}/"
+    response = unlogged_client.get(url)
+    another_user.username = "renamed"
+    another_user.save()
+    repeated = _revalidate(unlogged_client, url, response)
+    assert repeated.status_code == 200, (
+        "Убедитесь, что смена имени автора комментария меняет ETag."
+    )
+
+
+def test_list_validators_skip_post_table(
+    unlogged_client, post_with_published_location
+):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    post = post_with_published_location
+    for url in ("/", f"/category/{post.category.slug}/"):
+        response = unlogged_client.get(url)
+        with CaptureQueriesContext(connection) as captured:
+            repeated = _revalidate(unlogged_client, url, response)
+        assert repeated.status_code == 304
+        assert not captured.captured_queries, (
+            "Убедитесь, что валидаторы списков строятся без запросов к"
+            " базе данных."
+        )
+
+
+def test_comment_and_category_move_change_list_etags(
+    mixer, user, unlogged_client, post_with_published_location,
+    post_with_another_category
+):
+    post = post_with_published_location
+    old_category_url = f"/category/{post.category.slug}/"
+    feed = unlogged_client.get("/")
+    mixer.blend("blog.Comment", post=post, author=user)
+    assert _revalidate(unlogged_client, "/", feed).status_code == 200
+
+    response = unlogged_client.get(old_category_url)
+    post.category = post_with_another_category.category
+    post.save()
+    assert _revalidate(
+        unlogged_client, old_category_url, response).status_code == 200, (
+        "Убедитесь, что перенос публикации в другую категорию меняет"
+        " валидаторы прежней категории."
+    )
+
+
+def test_scheduled_post_changes_feed_etag(
+    monkeypatch, mixer, user, unlogged_client, post_with_published_location
+):
+    from datetime import timedelta
+
+    from blog import conditional
+
+    post = post_with_published_location
+    scheduled = mixer.blend(
+        "blog.Post", author=user, category=post.category, location=None,
+        is_published=True,
+        pub_date=conditional.publication_now() + timedelta(days=1))
+    response = unlogged_client.get("/")
+    assert _revalidate(unlogged_client, "/", response).status_code == 304
+    monkeypatch.setattr(
+        conditional, "publication_now",
+        lambda: scheduled.pub_date + timedelta(seconds=1))
+    assert _revalidate(unlogged_client, "/", response).status_code == 200, (
+        "Убедитесь, что выход отложенной публикации меняет валидаторы"
+        " ленты."
+    )
+
+
+@pytest.mark.parametrize("hidden", ("unpublished", "scheduled", "category"))
+def test_hidden_post_gets_no_validators(
+    hidden, user_client, unlogged_client, post_with_published_location
+):
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    post = post_with_published_location
+    if hidden == "unpublished":
+        post.is_published = False
+    elif hidden == "scheduled":
+        post.pub_date = timezone.now() + timedelta(days=1)
+    else:
+        post.category.is_published = False
+        post.category.save()
+    post.save()
+    url = f"/posts/{post.id}/"
+    for headers in (
+        {"HTTP_IF_NONE_MATCH": "*"},
+        {"HTTP_IF_MODIFIED_SINCE": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    ):
+        response = unlogged_client.get(url, **headers)
+        assert response.status_code == 404, (
+            "Убедитесь, что условный запрос скрытой публикации получает"
+            " тот же ответ 404, что и запрос несуществующей."
+        )
+    assert user_client.get(
+        url, HTTP_IF_NONE_MATCH="*").status_code == 304, (
+        "Автор по-прежнему видит свою скрытую публикацию."
+    )
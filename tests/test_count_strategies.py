@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+PER_PAGE = 10
+
+
+def _paginator(strategy, **kwargs):
+    from blog.models import Post
+    from blog.paginators import CountStrategyPaginator
+
+    return CountStrategyPaginator(
+        Post.objects.order_by("-pub_date"), PER_PAGE,
+        count_strategy=strategy, **kwargs)
+
+
+def _count_queries(captured):
+    return [q for q in captured.captured_queries if "COUNT(" in q["sql"]]
+
+
+@pytest.mark.parametrize("strategy", ("exact", "cached", "estimated", "none"))
+def test_paginator_template_renders(
+    strategy, many_posts_with_published_locations
+):
+    paginator = _paginator(strategy)
+    page = paginator.page(2)
+    assert len(page) == PER_PAGE
+    assert page.has_previous() and not page.has_next()
+    html = render_to_string(
+        "includes/paginator.html",
+        {"page_obj": page, "paginator": paginator},
+    )
+    assert "?page=1" in html
+    assert '<span class="page-link">2</span>' in html
+    assert "Последняя" not in html
+
+
+def test_none_strategy_never_counts(many_posts_with_published_locations):
+    with CaptureQueriesContext(connection) as captured:
+        page = _paginator("none").page(1)
+        assert page.has_next()
+    assert not _count_queries(captured)
+    assert len(captured.captured_queries) == 1
+
+
+def test_cached_count_invalidated_by_post_writes(
+    mixer, user, many_posts_with_published_locations
+):
+    assert _paginator("cached").count == PER_PAGE * 2
+    with CaptureQueriesContext(connection) as captured:
+        assert _paginator("cached").count == PER_PAGE * 2
+    assert not _count_queries(captured)
+
+    mixer.blend("blog.Post", author=user)
+    assert _paginator("cached").count == PER_PAGE * 2 + 1
+
+
+def test_estimated_count_uses_sqlite_stat(
+    many_posts_with_published_locations
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("Оценка строится по sqlite_stat1")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    with CaptureQueriesContext(connection) as captured:
+        count = _paginator(
+            "estimated", estimate_index="post_author_feed_idx").count
+    assert count == PER_PAGE * 2
+    assert not _count_queries(captured)
+
+
+def test_stale_estimate_neither_hides_nor_invents_pages(
+    mixer, user, many_posts_with_published_locations
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("Оценка строится по sqlite_stat1")
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    mixer.cycle(PER_PAGE * 3).blend("blog.Post", author=user)
+    with CaptureQueriesContext(connection) as captured:
+        paginator = _paginator(
+            "estimated", estimate_index="post_author_feed_idx")
+        page = paginator.page(4)
+    assert not _count_queries(captured), (
+        "Страница за пределами устаревшей оценки не должна считать строки"
+    )
+    assert len(page) == PER_PAGE and page.has_next(), (
+        "Устаревшая оценка не должна скрывать существующие страницы"
+    )
+    last = _paginator(
+        "estimated", estimate_index="post_author_feed_idx").page(5)
+    assert not last.has_next() and last.paginator.num_pages == 5
+
+    Post = paginator.object_list.model
+    Post.objects.filter(pk__in=Post.objects.order_by("pk").values("pk")[
+        :PER_PAGE * 4]).delete()
+    first = _paginator(
+        "estimated", estimate_index="post_author_feed_idx").page(1)
+    assert first.paginator.num_pages == 1, (
+        "На последней странице число объектов известно из выборки"
+    )
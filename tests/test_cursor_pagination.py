@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    base = datetime.now(tz=pytz.UTC) - timedelta(days=1)
+    # Пары публикаций с одинаковым временем проверяют разрешение по id.
+    pub_dates = (
+        base - timedelta(minutes=i // 2) for i in range(N_PER_PAGE * 3 - 1)
+    )
+    return mixer.cycle(N_PER_PAGE * 3 - 1).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=pub_dates,
+    )
+
+
+def _walk(client, url):
+    seen, pages = [], []
+    response = client.get(url)
+    while True:
+        assert response.status_code == 200
+        page = response.context["page_obj"]
+        pages.append(page)
+        seen.extend(post.id for post in page)
+        if not page.has_next():
+            return seen, pages
+        response = client.get(url, {"after": page.next_cursor})
+
+
+@pytest.mark.parametrize(
+    "url_getter",
+    (
+        lambda posts: "/",
+        lambda posts: f"/category/{posts[0].category.slug}/",
+        lambda posts: f"/profile/{posts[0].author.username}/",
+    ),
+)
+def test_cursor_walks_whole_feed(user_client, feed_posts, url_getter):
+    url = url_getter(feed_posts)
+    seen, pages = _walk(user_client, url)
+    expected = [
+        post.id for post in sorted(
+            feed_posts, key=lambda p: (p.pub_date, p.id), reverse=True)
+    ]
+    assert seen == expected, (
+        "Убедитесь, что курсорная пагинация выводит все публикации без"
+        " пропусков и повторов, «от новых к старым»."
+    )
+    assert len(pages) == 3
+    assert not pages[0].has_previous()
+
+    last = pages[-1]
+    response = user_client.get(url, {"before": last.previous_cursor})
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in pages[-2]
+    ]
+
+
+def test_cursor_first_page_skips_count(
+    user_client, feed_posts, django_assert_max_num_queries
+):
+    # Первый запрос заполняет кэш справочников процесса.
+    user_client.get("/")
+    with django_assert_max_num_queries(4) as captured:
+        user_client.get("/")
+    assert not any(
+        "COUNT(*)" in query["sql"] for query in captured.captured_queries
+    ), "Курсорная пагинация не должна подсчитывать число публикаций."
+
+
+def test_page_number_links_still_work(user_client, feed_posts):
+    response = user_client.get("/", {"page": 2})
+    assert response.status_code == 200
+    assert response.context["page_obj"].number == 2
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+
+
+def test_bad_cursor_is_404(user_client, feed_posts):
+    assert user_client.get("/", {"after": "garbage"}).status_code == 404
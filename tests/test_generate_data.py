@@ -0,0 +1,101 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+COUNTS = {
+    "users": 30, "categories": 4, "locations": 5, "posts": 300,
+    "comments": 3000,
+}
+
+
+def _generate(**options):
+    call_command(
+        "generate_data", stdout=io.StringIO(),
+        **{**COUNTS, "chunk_size": 70, **options})
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_generates_dataset(workers):
+    from blog.models import Category, Comment, Location, Post, User
+    from blog.search import search_posts
+
+    started = timezone.now()
+    _generate(workers=workers, password="secret")
+    assert User.objects.count() == COUNTS["users"]
+    assert Category.objects.count() == COUNTS["categories"]
+    assert Location.objects.count() == COUNTS["locations"]
+    assert Post.objects.count() == COUNTS["posts"]
+    assert Comment.objects.count() == COUNTS["comments"]
+
+    assert Post.objects.filter(pub_date__gt=started).exists(), (
+        "Убедитесь, что генерируются отложенные публикации."
+    )
+    assert Post.objects.filter(is_published=False).exists(), (
+        "Убедитесь, что генерируются снятые с публикации записи."
+    )
+    assert not Comment.objects.filter(
+        post__pub_date__gt=started).exists(), (
+        "Убедитесь, что комментарии оставлены только к вышедшим публикациям."
+    )
+    per_post = sorted(
+        Post.objects.values_list("comment_count", flat=True), reverse=True)
+    assert sum(per_post) == COUNTS["comments"], (
+        "Убедитесь, что счётчики комментариев пересчитаны."
+    )
+    assert per_post[0] > 10 * per_post[len(per_post) // 2], (
+        "Убедитесь, что комментарии распределены неравномерно."
+    )
+    authors = Post.objects.order_by().values("author").annotate(
+        total=Count("pk"))
+    assert max(row["total"] for row in authors) > 3 * (
+        COUNTS["posts"] / COUNTS["users"])
+
+    comment = Comment.objects.select_related("post").first()
+    assert comment.post.pub_date <= comment.created_at <= started + (
+        timedelta(seconds=1))
+    user = User.objects.first()
+    assert user.check_password("secret")
+    post = Post.objects.first()
+    assert search_posts(Post.objects.all(), post.title).exists()
+
+
+def test_chunks_do_not_depend_on_worker_count():
+    from blog import synthetic
+
+    context = {
+        "using": "default", "seed": 7, "locale": "ru_RU",
+        "now": timezone.now(), "days": 30, "skew": 0.9,
+        "future_share": 0.1, "unpublished_share": 0.1, "password": "!",
+        "user_ids": range(1, 11),
+        "past_posts": ([1, 2, 3], [60.0, 3600.0, 86400.0]),
+    }
+    synthetic.init_worker(context)
+    first = synthetic.make_comments(1, 50)
+    synthetic.make_comments(51, 50)
+    synthetic.init_worker(context)
+    assert synthetic.make_comments(1, 50) == first
+
+
+def test_requires_referenced_rows():
+    with pytest.raises(CommandError, match="auth_user"):
+        _generate(users=0, workers=1)
+
+
+def test_derived_data_uses_target_database(monkeypatch):
+    from blog.management.commands import generate_data
+
+    calls = []
+    monkeypatch.setattr(
+        generate_data, "call_command",
+        lambda name, **options: calls.append((name, options["database"])))
+    _generate(workers=1, comments=10, database="default")
+    assert calls == [
+        ("recount_comments", "default"), ("rebuild_search_index", "default")
+    ], "Убедитесь, что счётчики и индекс пересчитываются в той же базе."
@@ -0,0 +1,129 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.dumps import iter_json_array
+
+pytestmark = [pytest.mark.django_db]
+
+DB_JSON = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def _import(path, **options):
+    call_command("import_json", str(path), stdout=io.StringIO(), **options)
+
+
+@pytest.mark.parametrize("read_size", (1, 7, 1024))
+def test_array_parser_matches_json(read_size):
+    data = [
+        {"a": 'x],[\\"{', "b": [1, 2, {"c": "]"}]},
+        12345.5, -1e-7, "строка", [], {}, None,
+    ] * 5
+    for text in (json.dumps(data, indent=2), json.dumps(data)):
+        assert list(iter_json_array(io.StringIO(text), read_size)) == data
+
+
+@pytest.mark.parametrize("text", ("[1, 2", '{"a": 1}', "[1 2]", "[1,]"))
+def test_array_parser_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def test_imports_db_json(tmp_path):
+    from blog.models import Post, User
+    from blog.search import search_posts
+
+    dump = tmp_path / "db.json"
+    dump.write_bytes(DB_JSON.read_bytes())
+    _import(dump, chunk_size=10, transaction_size=50)
+
+    expected = json.loads(DB_JSON.read_text())
+    posts = [obj for obj in expected if obj["model"] == "blog.post"]
+    assert Post.objects.count() == len(posts)
+    assert User.objects.count() == 4
+    first = Post.objects.get(pk=posts[0]["pk"])
+    assert first.created_at.isoformat().startswith(
+        posts[0]["fields"]["created_at"][:19]), (
+        "Убедитесь, что значения auto_now_add берутся из дампа."
+    )
+    assert search_posts(Post.objects.all(), first.title).exists()
+    assert not (tmp_path / "db.json.import-state.json").exists()
+
+
+def _write(path, objects):
+    path.write_text(json.dumps(objects, ensure_ascii=False))
+    return path
+
+
+def _post(pk, category):
+    return {"model": "blog.post", "pk": pk, "fields": {
+        "title": f"Пост {pk}", "text": "Текст", "author": 1,
+        "category": category, "pub_date": "2020-01-01T00:00:00Z",
+        "is_published": True}}
+
+
+USER = {"model": "auth.user", "pk": 1, "fields": {
+    "username": "author", "password": "", "date_joined":
+    "2020-01-01T00:00:00Z"}}
+CATEGORY = {"model": "blog.category", "pk": 1, "fields": {
+    "title": "Категория", "description": "", "slug": "cat",
+    "is_published": True}}
+
+
+def test_derived_data_uses_import_database(tmp_path, monkeypatch):
+    from blog.management.commands import import_json
+
+    calls = []
+    monkeypatch.setattr(
+        import_json, "call_command",
+        lambda name, **options: calls.append((name, options["database"])))
+    dump = _write(tmp_path / "dump.json", [USER, CATEGORY, _post(1, 1)])
+    _import(dump, database="default")
+    assert calls == [
+        ("recount_comments", "default"), ("rebuild_search_index", "default")
+    ], "Убедитесь, что счётчики и индекс пересчитываются в той же базе."
+
+
+def test_missing_references_are_reported(tmp_path):
+    from blog.models import Post
+
+    dump = _write(tmp_path / "dump.json", [USER, CATEGORY, _post(1, 2)])
+    with pytest.raises(CommandError, match="blog.category.id=\\[2\\]"):
+        _import(dump)
+    # Ссылки проверяются после загрузки: строка с ошибкой уже вставлена.
+    Post.objects.filter(pk=1).delete()
+
+
+def test_resume_after_failure(tmp_path, monkeypatch):
+    from blog.management.commands import import_json
+    from blog.models import Post
+
+    dump = _write(
+        tmp_path / "dump.json",
+        [_post(pk, 1) for pk in range(1, 7)] + [USER, CATEGORY])
+    original = import_json.Importer.flush
+    calls = []
+
+    def failing_flush(self, model):
+        calls.append(model)
+        if len(calls) == 3:
+            raise RuntimeError("сбой")
+        original(self, model)
+
+    monkeypatch.setattr(import_json.Importer, "flush", failing_flush)
+    with pytest.raises(RuntimeError):
+        _import(dump, chunk_size=2, transaction_size=4)
+    assert Post.objects.count() == 4
+    state = json.loads((tmp_path / "dump.json.import-state.json").read_text())
+    assert state["objects"] == 4
+    with pytest.raises(CommandError, match="--resume"):
+        _import(dump)
+
+    monkeypatch.setattr(import_json.Importer, "flush", original)
+    _import(dump, chunk_size=2, transaction_size=4, resume=True)
+    assert sorted(Post.objects.values_list("pk", flat=True)) == list(
+        range(1, 7))
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_next, enqueue, run_pending, task
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task("tests.record")
+def record(value, fail_times=0):
+    calls.append(value)
+    if calls.count(value) <= fail_times:
+        raise RuntimeError("Временная ошибка")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls(settings):
+    settings.JOBS_RETRY_BACKOFF = 10
+    calls.clear()
+
+
+def test_enqueue_returns_immediately_and_worker_runs_job():
+    job = enqueue("tests.record", {"value": 1})
+    assert job.status == Job.PENDING and not calls
+    call_command("run_jobs", once=True, stdout=StringIO())
+    job.refresh_from_db()
+    assert job.status == Job.DONE and job.attempts == 1
+    assert calls == [1]
+
+
+def test_idempotency_key(django_assert_num_queries):
+    first = enqueue("tests.record", {"value": 1}, key="same")
+    with django_assert_num_queries(1):
+        second = enqueue("tests.record", {"value": 2}, key="same")
+    assert first.pk == second.pk
+    assert run_pending() == 1
+    assert calls == [1]
+
+
+def test_unknown_task_is_rejected():
+    with pytest.raises(LookupError):
+        enqueue("tests.missing")
+
+
+def test_retry_with_backoff():
+    job = enqueue("tests.record", {"value": 1, "fail_times": 2})
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.PENDING and "Временная ошибка" in job.last_error
+    assert job.run_at - timezone.now() > timedelta(seconds=5)
+    assert run_pending() == 0, "Повтор не должен запускаться до задержки."
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    run_pending()
+    job.refresh_from_db()
+    first_delay = job.run_at - timezone.now()
+    assert first_delay > timedelta(seconds=15), (
+        "Убедитесь, что задержка между повторами растёт."
+    )
+
+    Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.DONE and job.attempts == 3
+    assert calls == [1, 1, 1]
+
+
+def test_job_fails_after_max_attempts():
+    job = enqueue(
+        "tests.record", {"value": 1, "fail_times": 5}, max_attempts=1)
+    run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.FAILED and job.finished_at is not None
+
+
+def test_expired_lease_is_reclaimed():
+    enqueue("tests.record", {"value": 1})
+    job = claim_next()
+    assert job.status == Job.RUNNING
+    assert claim_next() is None, "Занятая задача не выдаётся повторно."
+
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1))
+    assert claim_next().pk == job.pk
+
+
+def test_password_reset_mail_is_queued(client, user):
+    user.email = "author@example.com"
+    user.save()
+    response = client.post(
+        "/auth/password_reset/", {"email": user.email})
+    assert response.status_code == 302
+    assert not mail.outbox, "Письмо должно отправляться фоновой задачей."
+    payload = Job.objects.get().payload
+    assert payload["user_id"] == user.pk
+    assert "/auth/reset/" not in str(payload), (
+        "Ссылка для сброса пароля не должна храниться в таблице задач."
+    )
+
+    assert run_pending() == 1
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    assert "/auth/reset/" in mail.outbox[0].body
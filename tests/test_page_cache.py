@@ -0,0 +1,164 @@
+import os
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def wide_clock_bucket(settings):
+    # Ключ страницы зависит от интервала часов публикации.
+    settings.PUBLICATION_CLOCK_BUCKET = 10 ** 6
+
+
+def _status(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response["X-Page-Cache"]
+
+
+def test_anonymous_pages_are_cached(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    for url in (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/profile/{post.author.username}/",
+        f"/posts/{post.id}/",
+    ):
+        assert _status(unlogged_client, url) == "MISS"
+        assert _status(unlogged_client, url) == "HIT", (
+            f"Убедитесь, что страница {url} кэшируется для анонимных"
+            " пользователей."
+        )
+
+
+def test_logged_in_pages_are_not_cached(
+    user_client, post_with_published_location
+):
+    user_client.get("/")
+    assert "X-Page-Cache" not in user_client.get("/")
+
+
+def test_comment_invalidates_post_pages_only(
+    mixer, user, unlogged_client, post_with_published_location,
+    post_with_another_category
+):
+    post = post_with_published_location
+    other_category = post_with_another_category.category
+    urls = ("/", f"/category/{post.category.slug}/", f"/posts/{post.id}/")
+    for url in urls + (f"/category/{other_category.slug}/",):
+        unlogged_client.get(url)
+
+    mixer.blend("blog.Comment", post=post, author=user)
+
+    for url in urls:
+        assert _status(unlogged_client, url) == "MISS"
+    assert _status(
+        unlogged_client, f"/category/{other_category.slug}/"
+    ) == "HIT"
+
+
+def test_page_stored_before_commit_is_dropped(
+    django_capture_on_commit_callbacks, unlogged_client,
+    post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = "Новый заголовок"
+        post.save()
+        # Параллельный запрос сохраняет страницу под новыми версиями
+        # тегов до фиксации транзакции.
+        assert _status(unlogged_client, url) == "MISS"
+        assert _status(unlogged_client, url) == "HIT"
+    assert _status(unlogged_client, url) == "MISS", (
+        "Убедитесь, что теги сбрасываются ещё раз после фиксации"
+        " транзакции."
+    )
+
+
+def test_reference_edits_invalidate(
+    unlogged_client, post_with_published_location
+):
+    post = post_with_published_location
+    unlogged_client.get(f"/posts/{post.id}/")
+    post.location.name = "Новое место"
+    post.location.save()
+    response = unlogged_client.get(f"/posts/{post.id}/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert "Новое место" in response.content.decode()
+
+    unlogged_client.get("/")
+    post.category.is_published = False
+    post.category.save()
+    response = unlogged_client.get("/")
+    assert response["X-Page-Cache"] == "MISS"
+    assert len(response.context["page_obj"]) == 0
+
+
+def test_last_login_does_not_invalidate(
+    client, user, post_with_published_location
+):
+    client.get(f"/profile/{user.username}/")
+    client.force_login(user)
+    client.logout()
+    assert _status(client, f"/profile/{user.username}/") == "HIT"
+
+
+def test_hit_miss_counters(unlogged_client, post_with_published_location):
+    from blog.page_cache import get_page_cache_stats
+
+    for _ in range(3):
+        unlogged_client.get("/")
+    assert get_page_cache_stats()["index"] == {"hits": 2, "misses": 1}
+
+
+def test_feed_key_follows_clock_and_post_page_does_not(
+    monkeypatch, settings, unlogged_client, post_with_published_location
+):
+    from datetime import timedelta
+
+    from blog import page_cache
+
+    post = post_with_published_location
+    for url in ("/", f"/posts/{post.id}/"):
+        unlogged_client.get(url)
+    clock = page_cache.publication_now()
+    monkeypatch.setattr(
+        page_cache, "publication_now", lambda: clock + timedelta(hours=1))
+    assert _status(unlogged_client, "/") == "MISS"
+    assert _status(unlogged_client, f"/posts/{post.id}/") == "HIT", (
+        "Убедитесь, что ключ страницы публикации не зависит от интервала"
+        " часов публикации."
+    )
+    assert page_cache.get_page_cache_timeout("index") == min(
+        settings.PAGE_CACHE_TTL["index"], settings.PUBLICATION_CLOCK_BUCKET)
+    assert page_cache.get_page_cache_timeout(
+        "post_detail", clock=False) == settings.PAGE_CACHE_TTL["post_detail"]
+
+
+def test_invalidation_reaches_other_processes(
+    unlogged_client, post_with_published_location
+):
+    import subprocess
+    import sys
+
+    from django.conf import settings
+
+    unlogged_client.get("/")
+    assert _status(unlogged_client, "/") == "HIT"
+    subprocess.run(
+        [sys.executable, "-c", (
+            "import django; django.setup(); "
+            "from blog.page_cache import invalidate_tags; "
+            "invalidate_tags('feed')"
+        )],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "blogicum.settings"},
+        check=True,
+    )
+    assert _status(unlogged_client, "/") == "MISS", (
+        "Убедитесь, что кэш общий для всех процессов сервера."
+    )
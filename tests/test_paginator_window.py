@@ -0,0 +1,21 @@
+import pytest
+from django.template.loader import render_to_string
+
+from blog.paginators import CountStrategyPaginator
+
+
+@pytest.mark.parametrize("n_posts", (10_000, 50_000, 1_000_000))
+def test_page_links_are_bounded(n_posts):
+    paginator = CountStrategyPaginator(range(n_posts), 10)
+    page = paginator.page(paginator.num_pages // 2)
+    html = render_to_string(
+        "includes/paginator.html",
+        {"page_obj": page, "paginator": paginator},
+    )
+    assert html.count("<li") <= 14, (
+        "Убедитесь, что пагинатор выводит ограниченное окно номеров"
+        " страниц, а не все страницы."
+    )
+    assert f"?page={paginator.num_pages}" in html
+    assert f'<span class="page-link">{page.number}</span>' in html
+    assert "…" in html
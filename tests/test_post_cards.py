@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+
+import pytest
+from django.test.signals import template_rendered
+
+pytestmark = [pytest.mark.django_db]
+
+CARD_TEMPLATE = "includes/post_card.html"
+
+
+@contextmanager
+def rendered_templates():
+    names = []
+
+    def collect(sender, template, **kwargs):
+        names.append(template.name)
+
+    template_rendered.connect(collect)
+    try:
+        yield names
+    finally:
+        template_rendered.disconnect(collect)
+
+
+def test_warm_page_skips_card_rendering(
+    user_client, many_posts_with_published_locations
+):
+    with rendered_templates() as names:
+        user_client.get("/")
+    assert names.count(CARD_TEMPLATE) == 10
+
+    with rendered_templates() as names:
+        user_client.get("/")
+    assert CARD_TEMPLATE not in names, (
+        "Убедитесь, что карточки публикаций берутся из кэша."
+    )
+
+
+def test_card_version_follows_changes(
+    mixer, user, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    mixer.blend("blog.Comment", post=post, author=user)
+    user.username = "renamed_author"
+    user.save()
+
+    with rendered_templates() as names:
+        content = user_client.get("/").content.decode()
+    assert names.count(CARD_TEMPLATE) == 1
+    assert "Комментарии (1)" in content
+    assert "@renamed_author" in content
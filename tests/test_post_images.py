@@ -0,0 +1,166 @@
+from datetime import timedelta
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from jobs.queue import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.POST_IMAGE_VARIANTS = {
+        "card": {"width": 60, "sizes": "60px"},
+        "detail": {"width": 80, "sizes": "80px"},
+    }
+    return tmp_path
+
+
+def _upload(size=(200, 100)):
+    data = BytesIO()
+    Image.new("RGB", size, "red").save(data, "JPEG")
+    return SimpleUploadedFile(
+        "photo.jpg", data.getvalue(), content_type="image/jpeg")
+
+
+def _create_post(mixer, user, published_category, published_location):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        location=published_location, is_published=True,
+        pub_date=timezone.now() - timedelta(days=1), image=_upload())
+
+
+@pytest.fixture
+def post_with_image(mixer, user, published_category, published_location):
+    post = _create_post(mixer, user, published_category, published_location)
+    run_pending()
+    return post
+
+
+def _variant_files(media_root):
+    return sorted(
+        path.name for path in (media_root / "images_fold").iterdir()
+        if path.name != "photo.jpg"
+    )
+
+
+def test_variants_created_by_job(
+    client, mixer, user, published_category, published_location, media_root
+):
+    post = _create_post(
+        mixer, user, published_category, published_location)
+    assert not _variant_files(media_root)
+    response = client.get(f"/posts/{post.id}/")
+    img = BeautifulSoup(response.content, "html.parser").find(
+        "img", src=post.image.url)
+    assert img is not None and not img.has_attr("srcset"), (
+        "Пока варианты не созданы, выводится оригинал изображения."
+    )
+    client.get("/")
+
+    assert run_pending() == 1
+    response = client.get("/")
+    assert BeautifulSoup(response.content, "html.parser").find(
+        "img", srcset=True), (
+        "Убедитесь, что после создания вариантов карточка перерисовывается."
+    )
+    assert _variant_files(media_root) == [
+        "photo_120w.jpg", "photo_160w.jpg", "photo_60w.jpg", "photo_80w.jpg",
+    ]
+    with Image.open(media_root / "images_fold" / "photo_60w.jpg") as image:
+        assert image.size == (60, 30)
+
+
+def test_variants_are_not_regenerated(media_root, post_with_image):
+    variant = media_root / "images_fold" / "photo_60w.jpg"
+    mtime = variant.stat().st_mtime_ns
+    post_with_image.title = "Новый заголовок"
+    post_with_image.save()
+    assert run_pending() == 0
+    assert variant.stat().st_mtime_ns == mtime
+    assert len(_variant_files(media_root)) == 4
+
+
+def test_templates_render_srcset(client, post_with_image):
+    response = client.get(f"/posts/{post_with_image.id}/")
+    img = BeautifulSoup(response.content, "html.parser").find(
+        "img", srcset=True)
+    assert img["src"].endswith("photo_80w.jpg")
+    assert img["srcset"] == (
+        "/images_fold/photo_80w.jpg 80w, /images_fold/photo_160w.jpg 160w")
+    assert (img["width"], img["height"]) == ("80", "40")
+
+    response = client.get("/")
+    img = BeautifulSoup(response.content, "html.parser").find(
+        "img", srcset=True)
+    assert img["src"].endswith("photo_60w.jpg")
+    assert img["loading"] == "lazy"
+
+
+def test_small_images_are_not_upscaled(mixer, user):
+    post = mixer.blend("blog.Post", author=user, image=_upload((50, 50)))
+    run_pending()
+    from blog.images import get_responsive_image
+
+    image = get_responsive_image(post.image, "detail")
+    assert image["srcset"] == f"{post.image.url} 50w"
+    assert (image["width"], image["height"]) == (50, 50)
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_backfill_command(media_root, post_with_image, workers):
+    for path in (media_root / "images_fold").glob("photo_*w.jpg"):
+        path.unlink()
+    call_command("create_image_variants", workers=workers, stdout=StringIO())
+    assert len(_variant_files(media_root)) == 4
+
+
+def test_render_reads_only_header(monkeypatch, media_root, mixer, user):
+    from django.core.cache import cache
+
+    from blog import images
+
+    data = BytesIO()
+    exif = Image.Exif()
+    exif[images.EXIF_ORIENTATION] = 6
+    Image.new("RGB", (200, 100), "red").save(data, "JPEG", exif=exif)
+    post = mixer.blend("blog.Post", author=user, image=SimpleUploadedFile(
+        "photo.jpg", data.getvalue(), content_type="image/jpeg"))
+    run_pending()
+    cache.clear()
+
+    def decode(*args, **kwargs):
+        raise AssertionError("Изображение декодируется при отрисовке")
+
+    monkeypatch.setattr(Image.Image, "load", decode)
+    info = images.get_image_info(post.image)
+    assert info["size"] == (100, 200), (
+        "Убедитесь, что размер учитывает ориентацию из EXIF."
+    )
+
+
+def test_pending_marker_skips_storage(
+    monkeypatch, media_root, mixer, user, published_category,
+    published_location
+):
+    from blog import images
+
+    post = _create_post(
+        mixer, user, published_category, published_location)
+    assert images.get_image_info(post.image) is None
+    checks = []
+    monkeypatch.setattr(
+        FileSystemStorage, "exists",
+        lambda storage, name: checks.append(name))
+    assert images.get_image_info(post.image) is None
+    assert not checks, (
+        "Пока варианты создаются, отрисовка не должна проверять файлы."
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_clock_is_quantized(settings, monkeypatch):
+    from blog.utils import publication_now
+
+    settings.PUBLICATION_CLOCK_BUCKET = 30
+    start = datetime(2024, 1, 1, 12, 0, 30, 500, tzinfo=pytz.UTC)
+    for shift in (0, 10, 29):
+        monkeypatch.setattr(
+            timezone, "now", lambda: start + timedelta(seconds=shift)
+        )
+        assert publication_now() == start.replace(microsecond=0)
+    monkeypatch.setattr(timezone, "now", lambda: start + timedelta(seconds=30))
+    assert publication_now() == start.replace(microsecond=0) + timedelta(
+        seconds=30
+    )
+
+
+def test_scheduled_post_appears_without_restart(
+    mixer, user, published_category, user_client, monkeypatch
+):
+    real_now = timezone.now()
+    post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=real_now + timedelta(minutes=5),
+    )
+    response = user_client.get("/")
+    assert post not in response.context["page_obj"]
+
+    monkeypatch.setattr(
+        timezone, "now", lambda: real_now + timedelta(minutes=6)
+    )
+    response = user_client.get("/")
+    assert post in response.context["page_obj"], (
+        "Убедитесь, что отложенная публикация появляется на главной"
+        " странице после наступления даты публикации."
+    )
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != "sqlite",
+        reason="Проверка планов рассчитана на формат EXPLAIN QUERY PLAN SQLite",
+    ),
+]
+
+N_POSTS = 3000
+N_CATEGORIES = 20
+
+
+@pytest.fixture
+def large_dataset(mixer, user, another_user):
+    from blog.models import Category, Comment, Post
+
+    categories = mixer.cycle(N_CATEGORIES).blend(
+        "blog.Category", is_published=True
+    )
+    now = datetime.now(tz=pytz.UTC)
+    posts = Post.objects.bulk_create(
+        Post(
+            title=f"Публикация {i}",
+            text="Текст",
+            pub_date=now - timedelta(minutes=i - 100),
+            author=user if i % 7 else another_user,
+            category=categories[i % N_CATEGORIES],
+            is_published=bool(i % 11),
+        )
+        for i in range(N_POSTS)
+    )
+    post = Post.objects.filter(is_published=True).first()
+    Comment.objects.bulk_create(
+        Comment(post=post, author=user, text=f"Комментарий {i}")
+        for i in range(200)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return {"post": post, "category": categories[0], "posts": posts}
+
+
+def _post_queries_plans(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url)
+    assert response.status_code == 200
+    plans = {}
+    with connection.cursor() as cursor:
+        for query in captured.captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or (
+                "blog_post" not in sql and "blog_comment" not in sql
+            ):
+                continue
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            plans[sql] = [row[-1] for row in cursor.fetchall()]
+    assert plans
+    return plans
+
+
+def _assert_indexed(plans, page_name):
+    for sql, plan in plans.items():
+        for step in plan:
+            assert "TEMP B-TREE" not in step, (
+                f"Запрос страницы {page_name} сортируется без индекса:\n"
+                f"{sql}\n{plan}"
+            )
+            for table in ("blog_post", "blog_comment"):
+                assert step.strip() != f"SCAN {table}" and not (
+                    step.startswith(f"SCAN TABLE {table}")
+                    and "INDEX" not in step
+                ), (
+                    f"Запрос страницы {page_name} читает всю таблицу"
+                    f" {table}:\n{sql}\n{plan}"
+                )
+
+
+def test_feed_plan(user_client, large_dataset):
+    _assert_indexed(_post_queries_plans(user_client, "/"), "ленты")
+
+
+def test_category_plan(user_client, large_dataset):
+    slug = large_dataset["category"].slug
+    _assert_indexed(
+        _post_queries_plans(user_client, f"/category/{slug}/"),
+        "категории",
+    )
+
+
+def test_profile_plan(user_client, another_user, large_dataset):
+    _assert_indexed(
+        _post_queries_plans(user_client, f"/profile/{another_user.username}/"),
+        "профиля",
+    )
+
+
+def test_detail_plan(user_client, large_dataset):
+    post = large_dataset["post"]
+    _assert_indexed(
+        _post_queries_plans(user_client, f"/posts/{post.id}/"),
+        "публикации",
+    )
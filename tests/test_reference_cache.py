@@ -0,0 +1,147 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _reference_queries(captured):
+    return [
+        query["sql"] for query in captured.captured_queries
+        if '"blog_category"' in query["sql"]
+        or '"blog_location"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize("url", ("/", "category", "post"))
+def test_warm_pages_skip_reference_tables(
+    url, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = {
+        "category": f"/category/{post.category.slug}/",
+        "post": f"/posts/{post.id}/",
+    }.get(url, url)
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as captured:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert not _reference_queries(captured), (
+        "Категории и местоположения должны браться из кэша процесса."
+    )
+    content = response.content.decode()
+    assert post.category.title in content
+    assert post.location.name in content
+
+
+def test_edits_are_visible_immediately(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    post.location.name = "Новое место"
+    post.location.save()
+    post.category.is_published = False
+    post.category.save()
+
+    response = user_client.get("/")
+    assert len(response.context["page_obj"]) == 0
+    response = user_client.get(f"/category/{post.category.slug}/")
+    assert response.status_code == 404
+    response = user_client.get(f"/posts/{post.id}/")
+    assert "Новое место" in response.content.decode()
+
+
+def test_other_worker_invalidation(settings, mixer):
+    from blog.models import Category
+    from blog.page_cache import invalidate_tags
+    from blog.reference_cache import ReferenceCache
+
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 60
+    category = mixer.blend("blog.Category", title="Старое")
+    worker = ReferenceCache(Category, index_fields=("slug",))
+    assert worker.get(category.id).title == "Старое"
+
+    Category.objects.filter(id=category.id).update(title="Новое")
+    invalidate_tags(worker.tag)
+    assert worker.get(category.id).title == "Старое", (
+        "Поколение проверяется не чаще REFERENCE_CACHE_CHECK_INTERVAL."
+    )
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    assert worker.get(category.id).title == "Новое"
+
+
+def test_invalidation_from_other_process(settings, mixer):
+    import os
+    import subprocess
+    import sys
+
+    from blog.models import Category
+    from blog.reference_cache import categories
+
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    category = mixer.blend("blog.Category", title="Старое")
+    assert categories.get(category.id).title == "Старое"
+
+    Category.objects.filter(id=category.id).update(title="Новое")
+    subprocess.run(
+        [sys.executable, "-c", (
+            "import django; django.setup(); "
+            "from blog.reference_cache import categories; "
+            "categories.invalidate()"
+        )],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "blogicum.settings"},
+        check=True,
+    )
+    assert categories.get(category.id).title == "Новое", (
+        "Убедитесь, что поколение справочника хранится в общем кэше."
+    )
+
+
+def test_stale_read_before_commit_is_dropped(
+    django_capture_on_commit_callbacks, settings, mixer
+):
+    from blog.models import Category
+    from blog.reference_cache import categories
+
+    settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+    category = mixer.blend("blog.Category", title="Старое")
+    with django_capture_on_commit_callbacks(execute=True):
+        category.title = "Новое"
+        category.save()
+        # Параллельный читатель уже видит новое поколение, но строку —
+        # до фиксации транзакции.
+        categories._sync()
+        stale = Category.objects.get(id=category.id)
+        stale.title = "Старое"
+        categories._store([stale])
+    assert categories.get(category.id).title == "Новое", (
+        "Убедитесь, что кэш справочника сбрасывается после фиксации."
+    )
+
+
+def test_size_is_bounded(settings, mixer):
+    from blog.models import Category
+    from blog.reference_cache import ReferenceCache
+
+    settings.REFERENCE_CACHE_SIZE = 2
+    first, second, third = mixer.cycle(3).blend("blog.Category")
+    cache = ReferenceCache(Category, index_fields=("slug",))
+    cache.get_many([first.id, second.id])
+    cache.get(first.id)
+    cache.get(third.id)
+    assert set(cache._rows) == {first.id, third.id}
+    assert second.slug not in cache._indexes["slug"]
+
+    with CaptureQueriesContext(connection) as captured:
+        assert cache.get_by("slug", third.slug).id == third.id
+    assert not captured.captured_queries
+
+
+def test_returned_objects_are_independent(mixer):
+    from blog.reference_cache import categories
+
+    category = mixer.blend("blog.Category", title="Заголовок")
+    categories.get(category.id).title = "Изменено"
+    assert categories.get(category.id).title == "Заголовок"
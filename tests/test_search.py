@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category, published_location):
+    def make(title, text, **kwargs):
+        fields = dict(
+            author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+        fields.update(kwargs)
+        return mixer.blend("blog.Post", title=title, text=text, **fields)
+    return make
+
+
+def _search(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == 200
+    return response
+
+
+def _titles(response):
+    return [post.title for post in response.context["page_obj"]]
+
+
+def test_results_ranked_and_highlighted(client, make_post):
+    make_post("Прогулка", "Заметки о горах и озёрах")
+    make_post("Горы Кавказа", "Горы и горы, снова горы")
+    make_post("Море", "Про море")
+
+    response = _search(client, "гор")
+    assert _titles(response) == ["Горы Кавказа", "Прогулка"], (
+        "Убедитесь, что результаты упорядочены по релевантности."
+    )
+    content = response.content.decode()
+    assert "<mark>Горы</mark> Кавказа" in content
+
+
+def test_markup_in_posts_is_escaped(client, make_post):
+    make_post("<script>alert(1)</script> горы", "<b>горы</b>")
+    content = _search(client, "горы").content.decode()
+    assert "<script>alert" not in content
+    assert "&lt;b&gt;<mark>горы</mark>&lt;/b&gt;" in content
+
+
+def test_query_syntax_is_not_interpreted(client, make_post):
+    make_post("Горы", "текст")
+    assert _titles(_search(client, 'горы" OR NEAR(*')) == []
+    assert _titles(_search(client, "")) == []
+
+
+def test_visibility_rules(client, make_post, published_category, mixer):
+    make_post("Горы видимые", "текст")
+    make_post("Горы скрытые", "текст", is_published=False)
+    make_post(
+        "Горы будущие", "текст", pub_date=timezone.now() + timedelta(days=1))
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    make_post("Горы в скрытой категории", "текст", category=hidden_category)
+
+    assert _titles(_search(client, "горы")) == ["Горы видимые"]
+
+
+def test_index_follows_save_and_delete(client, make_post):
+    post = make_post("Старое название", "текст")
+    post.title = "Новое название"
+    post.save()
+    assert _titles(_search(client, "старое")) == []
+    assert _titles(_search(client, "новое")) == ["Новое название"]
+
+    post.delete()
+    assert _titles(_search(client, "новое")) == []
+
+
+def test_pagination_keeps_query(client, make_post, settings):
+    for index in range(settings.PAGE_SIZE + 1):
+        make_post(f"Горы {index}", "текст")
+    make_post("Море", "текст")
+    response = _search(client, "горы")
+    assert len(response.context["page_obj"]) == settings.PAGE_SIZE
+    assert "?q=%D0%B3%D0%BE%D1%80%D1%8B&amp;page=2" in (
+        response.content.decode())
+    assert len(_search(client, "горы", page=2).context["page_obj"]) == 1
+
+
+def test_rebuild_command(client, make_post):
+    post = make_post("Горы", "текст")
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_fts")
+        cursor.execute(
+            "INSERT INTO blog_post_fts(rowid, title, text)"
+            " VALUES (%s, 'Горы удалённые', '')", [post.id + 1000])
+    assert _titles(_search(client, "горы")) == []
+
+    call_command("rebuild_search_index", chunk_size=1, stdout=StringIO())
+    assert _titles(_search(client, "горы")) == ["Горы"]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM blog_post_fts")
+        assert cursor.fetchone()[0] == 1
+
+
+def test_admin_search_uses_index(admin_client, make_post):
+    make_post("Горы", "текст")
+    make_post("Море", "текст")
+    response = admin_client.get("/admin/blog/post/", {"q": "гор"})
+    assert response.status_code == 200
+    assert [
+        post.title for post in response.context["cl"].result_list
+    ] == ["Горы"]
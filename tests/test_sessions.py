@@ -0,0 +1,130 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _queries(captured, table):
+    return [
+        query["sql"] for query in captured.captured_queries
+        if f'"{table}"' in query["sql"]
+    ]
+
+
+def test_warm_request_skips_session_and_user(user_client, user):
+    user_client.get("/profile/")
+    with CaptureQueriesContext(connection) as captured:
+        response = user_client.get("/profile/")
+    assert response.status_code == 200
+    assert response.context["user"] == user
+    assert not _queries(captured, "django_session"), (
+        "Убедитесь, что сессия читается из кэша, а продление срока её"
+        " жизни не перезаписывает строку в базе данных на каждом запросе."
+    )
+    assert not _queries(captured, "auth_user"), (
+        "Убедитесь, что пользователь сессии загружается из кэша."
+    )
+
+
+def test_unchanged_session_is_not_saved(user_client):
+    user_client.get("/profile/")
+    with CaptureQueriesContext(connection) as captured:
+        user_client.get("/profile/")
+    assert not [
+        sql for sql in _queries(captured, "django_session")
+        if sql.startswith(("UPDATE", "INSERT"))
+    ], "Убедитесь, что неизменённая сессия не перезаписывается."
+
+
+def test_touch_rewrites_row_after_interval(user_client, settings):
+    from blogicum.sessions import TOUCH_PREFIX
+
+    settings.SESSION_SAVE_EVERY_REQUEST = True
+
+    user_client.get("/profile/")
+    # Интервал с последней записи строки истёк.
+    cache.delete(TOUCH_PREFIX + user_client.session.session_key)
+    with CaptureQueriesContext(connection) as captured:
+        user_client.get("/profile/")
+    assert [
+        sql for sql in _queries(captured, "django_session")
+        if sql.startswith("UPDATE")
+    ]
+
+
+def test_sessions_survive_cache_loss(user_client, user):
+    user_client.get("/profile/")
+    cache.clear()
+    response = user_client.get("/profile/")
+    assert response.context["user"] == user
+
+
+def test_profile_edit_is_visible_immediately(user_client, user):
+    user_client.get("/profile/")
+    response = user_client.post("/profile/", {
+        "first_name": "Новое имя",
+        "username": user.username,
+        "email": "new@example.com",
+    })
+    assert response.status_code == 302
+    response = user_client.get("/profile/")
+    assert response.context["user"].first_name == "Новое имя"
+
+
+def test_password_change_ends_other_sessions(user):
+    other = Client()
+    other.force_login(user)
+    assert other.get("/profile/").context["user"] == user
+
+    user.set_password("new-password-123")
+    user.save()
+    response = other.get("/profile/")
+    assert response.status_code == 302, (
+        "Убедитесь, что после смены пароля остальные сессии пользователя"
+        " завершаются."
+    )
+
+
+def test_logout_forgets_user(user_client, user):
+    from blogicum.auth import get_user_cache_key
+
+    user_client.get("/profile/")
+    assert cache.get(get_user_cache_key(user.pk)) is not None
+    user_client.post("/auth/logout/")
+    assert cache.get(get_user_cache_key(user.pk)) is None
+    assert user_client.get("/profile/").status_code == 302
+
+
+def test_user_invalidation_reaches_other_processes(user):
+    import os
+    import subprocess
+    import sys
+
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    other = Client()
+    other.force_login(user)
+    assert other.get("/profile/").context["user"] == user
+
+    # Пароль меняется в обход сигналов, кэш сбрасывает другой процесс.
+    user.set_password("new-password-123")
+    get_user_model().objects.filter(pk=user.pk).update(
+        password=user.password)
+    subprocess.run(
+        [sys.executable, "-c", (
+            "import django; django.setup(); "
+            "from blogicum.auth import invalidate_cached_user; "
+            f"invalidate_cached_user({user.pk})"
+        )],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": "blogicum.settings"},
+        check=True,
+    )
+    assert other.get("/profile/").status_code == 302, (
+        "Убедитесь, что пользователи сессий хранятся в общем для всех"
+        " процессов кэше."
+    )
@@ -0,0 +1,52 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+def _pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_connection_pragmas():
+    assert _pragma("busy_timeout") == 5000
+    assert _pragma("synchronous") == 1, "Ожидается synchronous = NORMAL."
+    assert _pragma("temp_store") == 2, "Ожидается temp_store = MEMORY."
+    assert _pragma("cache_size") == -20000
+    assert _pragma("foreign_keys") == 1
+
+
+def test_busy_timeout_goes_first():
+    from blogicum.sqlite.base import get_pragma_statements
+
+    statements = get_pragma_statements(
+        {"journal_mode": "wal", "busy_timeout": 100})
+    assert statements == [
+        "PRAGMA busy_timeout = 100", "PRAGMA journal_mode = wal"]
+
+
+@pytest.mark.django_db
+def test_wal_on_file_database(tmp_path):
+    from blogicum.sqlite.base import DatabaseWrapper
+
+    wrapper = DatabaseWrapper({
+        **connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="wal_check")
+    try:
+        with wrapper.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+    finally:
+        wrapper.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_transactions_take_write_lock_upfront():
+    from blog.models import Category
+
+    with CaptureQueriesContext(connection) as captured:
+        with transaction.atomic():
+            Category.objects.exists()
+    assert captured.captured_queries[0]["sql"] == "BEGIN IMMEDIATE"
@@ -0,0 +1,113 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient, Client, override_settings
+
+BOOTSTRAP = "css/bootstrap.min.css"
+
+
+@pytest.fixture(scope="module")
+def collected_static(tmp_path_factory):
+    # Сжатие brotli небыстрое, поэтому статика собирается один раз.
+    root = tmp_path_factory.mktemp("static")
+    with override_settings(STATIC_ROOT=root):
+        call_command("collectstatic", interactive=False, stdout=StringIO())
+    return root
+
+
+@pytest.fixture
+def static_root(settings, collected_static):
+    settings.STATIC_ROOT = collected_static
+    return collected_static
+
+
+@pytest.fixture
+def hashed_bootstrap(static_root):
+    manifest = json.loads((static_root / "staticfiles.json").read_text())
+    return manifest["paths"][BOOTSTRAP]
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(
+    static_root, hashed_bootstrap
+):
+    assert hashed_bootstrap != BOOTSTRAP
+    original = (static_root / hashed_bootstrap).read_bytes()
+    compressed = static_root / f"{hashed_bootstrap}.gz"
+    assert compressed.is_file(), (
+        "Убедитесь, что collectstatic сохраняет рядом с файлом .gz копию."
+    )
+    assert gzip.decompress(compressed.read_bytes()) == original
+    assert not (static_root / "img/logo.png.gz").exists(), (
+        "Изображения не нужно сжимать повторно."
+    )
+
+
+@pytest.mark.django_db
+def test_precompressed_variant_is_served(static_root, hashed_bootstrap):
+    response = Client().get(
+        f"/static/{hashed_bootstrap}", HTTP_ACCEPT_ENCODING="gzip, deflate")
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Content-Type"] == "text/css"
+    assert "Accept-Encoding" in response["Vary"]
+    assert "immutable" in response["Cache-Control"]
+    body = gzip.decompress(b"".join(response.streaming_content))
+    assert body == (static_root / hashed_bootstrap).read_bytes()
+
+
+@pytest.mark.django_db
+def test_brotli_variant_is_preferred(static_root, hashed_bootstrap):
+    import brotli
+
+    compressed = static_root / f"{hashed_bootstrap}.br"
+    assert compressed.is_file(), (
+        "Убедитесь, что collectstatic сохраняет рядом с файлом .br копию."
+    )
+    response = Client().get(
+        f"/static/{hashed_bootstrap}", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "br"
+    body = brotli.decompress(b"".join(response.streaming_content))
+    assert body == (static_root / hashed_bootstrap).read_bytes()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("accept", ("", "gzip;q=0, identity"))
+def test_identity_when_gzip_not_accepted(
+    static_root, hashed_bootstrap, accept
+):
+    response = Client().get(
+        f"/static/{hashed_bootstrap}", HTTP_ACCEPT_ENCODING=accept)
+    assert not response.has_header("Content-Encoding")
+    assert b"".join(response.streaming_content) == (
+        static_root / hashed_bootstrap).read_bytes()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_served_through_async_handler(static_root, hashed_bootstrap):
+    response = async_to_sync(AsyncClient().get)(
+        f"/static/{hashed_bootstrap}", **{"accept-encoding": "gzip"})
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+
+
+@pytest.mark.django_db
+def test_unhashed_names_are_not_immutable(static_root):
+    response = Client().get(f"/static/{BOOTSTRAP}")
+    assert response.status_code == 200
+    assert "immutable" not in response["Cache-Control"]
+
+
+@pytest.mark.django_db
+def test_base_template_uses_local_hashed_bootstrap(
+    static_root, hashed_bootstrap
+):
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    staticfiles_storage.hashed_files = staticfiles_storage.load_manifest()
+    content = Client().get("/pages/about/").content.decode()
+    assert f'href="/static/{hashed_bootstrap}"' in content
+    assert "cdn.jsdelivr.net" not in content
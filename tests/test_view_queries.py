@@ -0,0 +1,107 @@
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def own_comment(mixer, user, post_with_published_location):
+    return mixer.blend(
+        "blog.Comment", post=post_with_published_location, author=user)
+
+
+@pytest.fixture
+def post_url(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.id}/"
+    # Первый запрос заполняет кэш справочников процесса.
+    user_client.get(url)
+    return url
+
+
+def _selects(captured, table):
+    return [
+        query["sql"] for query in captured.captured_queries
+        if query["sql"].startswith("SELECT")
+        and f'FROM "{table}"' in query["sql"]
+    ]
+
+
+@pytest.mark.parametrize(
+    "suffix, budget",
+    (
+        ("edit/", 3),
+        ("delete/", 1),
+        ("edit_comment/{comment}/", 1),
+        ("delete_comment/{comment}/", 1),
+    ),
+)
+def test_get_budgets(
+    user_client, post_url, own_comment, suffix, budget,
+    django_assert_num_queries,
+):
+    url = post_url + suffix.format(comment=own_comment.id)
+    with django_assert_num_queries(budget) as captured:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    table = "blog_comment" if "comment" in suffix else "blog_post"
+    assert len(_selects(captured, table)) == 1, (
+        "Убедитесь, что объект, доступ к которому проверяется, загружается"
+        " из базы данных один раз за запрос."
+    )
+
+
+def test_post_edit_budget(
+    user_client, post_url, post_with_published_location,
+    django_assert_num_queries,
+):
+    post = post_with_published_location
+    data = {
+        "title": "Новый заголовок",
+        "text": "Новый текст",
+        "pub_date": "2020-01-01 00:00",
+        "category": post.category_id,
+        "location": post.location_id,
+        "is_published": True,
+    }
+    with django_assert_num_queries(9) as captured:
+        response = user_client.post(post_url + "edit/", data)
+    assert response.status_code == 302
+    assert len(_selects(captured, "blog_post")) == 1
+    post.refresh_from_db()
+    assert post.title == "Новый заголовок"
+
+
+def test_comment_write_budgets(
+    user_client, post_url, own_comment, django_assert_num_queries
+):
+    url = f"{post_url}edit_comment/{own_comment.id}/"
+    with django_assert_num_queries(3):
+        response = user_client.post(url, {"text": "Новый текст"})
+    assert response.status_code == 302
+
+    url = f"{post_url}delete_comment/{own_comment.id}/"
+    with django_assert_num_queries(5):
+        response = user_client.post(url)
+    assert response.status_code == 302
+
+
+def test_post_delete_budget(
+    user_client, post_url, django_assert_num_queries
+):
+    with django_assert_num_queries(4):
+        response = user_client.post(post_url + "delete/")
+    assert response.status_code == 302
+
+
+def test_foreign_objects_rejected_after_one_fetch(
+    another_user_client, post_url, own_comment, django_assert_num_queries
+):
+    another_user_client.get(post_url)
+    with django_assert_num_queries(1):
+        response = another_user_client.get(post_url + "edit/")
+    assert response.status_code == 302
+    assert response["Location"] == post_url
+
+    with django_assert_num_queries(1):
+        response = another_user_client.get(
+            f"{post_url}edit_comment/{own_comment.id}/")
+    assert response.status_code == 404
@@ -0,0 +1,11 @@
+from pathlib import Path
+
+from django.conf import settings
+
+
+def test_preload_compiles_every_project_template():
+    from blogicum.warmup import preload_templates
+
+    templates = list(Path(settings.TEMPLATES_DIR).rglob("*.html"))
+    assert preload_templates() == len(templates)
+
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+
+@pytest.fixture
+def queue_settings(settings):
+    settings.WRITE_QUEUE_ENABLED = True
+    settings.WRITE_QUEUE_MAX_PENDING = 3
+    settings.WRITE_QUEUE_TIMEOUT = 5
+    return settings
+
+
+@pytest.fixture
+def busy_writer(queue_settings):
+    """Очередь, писатель которой занят, пока не установлено ``release``."""
+    from blog.writer import WriteQueue
+
+    write_queue = WriteQueue()
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=write_queue.run, args=(block,))
+    thread.start()
+    assert started.wait(5)
+    yield write_queue, release
+    release.set()
+    thread.join()
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Писатель очереди не отвечает."
+        time.sleep(0.001)
+
+
+def _submit(write_queue, func, results):
+    def target():
+        try:
+            results.append(write_queue.run(func))
+        except Exception as error:
+            results.append(error)
+
+    pending = write_queue._queue.qsize()
+    thread = threading.Thread(target=target)
+    thread.start()
+    _wait_until(lambda: (
+        write_queue._queue.qsize() != pending or not thread.is_alive()))
+    return thread
+
+
+def test_comment_goes_through_writer(
+    queue_settings, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Через очередь"})
+    assert response.status_code == 302
+    post.refresh_from_db()
+    assert post.comment_count == 1
+    assert post.comments.get().text == "Через очередь"
+
+
+def test_back_pressure(busy_writer):
+    from blog.writer import WriteQueueFull
+
+    write_queue, release = busy_writer
+    results = []
+    threads = [
+        _submit(write_queue, lambda: "queued", results) for _ in range(3)
+    ]
+    with pytest.raises(WriteQueueFull):
+        write_queue.run(lambda: "rejected")
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == ["queued"] * 3
+
+
+def test_timeout_cancels_write(busy_writer, queue_settings):
+    from blog.writer import WriteTimeout
+
+    write_queue, release = busy_writer
+    queue_settings.WRITE_QUEUE_TIMEOUT = 0.1
+    calls = []
+    with pytest.raises(WriteTimeout):
+        write_queue.run(calls.append, "late")
+    release.set()
+    # Отменённая запись занимает место, пока писатель её не пропустит.
+    _wait_until(lambda: not write_queue._queue.qsize())
+    write_queue.run(calls.append, "next")
+    assert calls == ["next"], (
+        "Убедитесь, что запись, не дождавшаяся писателя, не выполняется."
+    )
+
+
+def test_batch_isolates_failures(busy_writer):
+    from blog.models import Category, Location
+
+    def fail():
+        Location.objects.create(name="Отменено")
+        raise ValueError("ошибка записи")
+
+    write_queue, release = busy_writer
+    results = []
+    threads = [
+        _submit(write_queue, func, results) for func in (
+            lambda: Category.objects.create(title="А", slug="a").slug,
+            fail,
+            lambda: Location.objects.create(name="Б").name,
+        )
+    ]
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert sorted(map(str, results)) == ["a", "Б", "ошибка записи"]
+    assert list(Location.objects.values_list("name", flat=True)) == ["Б"]
+
+
+def test_overload_is_503(
+    queue_settings, user_client, post_with_published_location, monkeypatch
+):
+    from blog.writer import WriteQueueFull, write_queue
+
+    def full(*args, **kwargs):
+        raise WriteQueueFull
+
+    monkeypatch.setattr(write_queue, "run", full)
+    post = post_with_published_location
+    response = user_client.post(
+        f"/posts/{post.id}/comment/", {"text": "Текст"})
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+    assert not post.comments.exists()